@@ -1,26 +1,1255 @@
-from flask import Flask, request, render_template, redirect, url_for, flash, session, abort
+from flask import Flask, Response, request, render_template, redirect, url_for, flash, session, abort, g, has_request_context
 import sqlite3
 import os
 import shutil
+import threading
+import json
+import queue
+
+import click
+
+import request_profiler
+import salary_analytics
 
 # Initialize Flask application
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', os.urandom(24).hex())
 
-DATABASE_PATH = 'database.db'
+DATABASE_PATH = os.environ.get('DATABASE_PATH', 'database.db')
+
+# Archive of old finalized applications, kept next to the main database
+ARCHIVE_DATABASE_PATH = os.environ.get(
+    'ARCHIVE_DATABASE_PATH', 
+    os.path.join(os.path.dirname(DATABASE_PATH), 'archive.db')
+)
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '180'))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', '200'))
+
+def get_database_connection():
+    """
+    Establishes a connection to the SQLite database.
+    
+    Returns:
+        sqlite3.Connection: Database connection with foreign keys enabled
+        and row factory set to sqlite3.Row for dict-like access
+    """
+    profile = get_request_profile()
+    if profile is not None:
+        # Profiled requests record every statement with its timing
+        con = profile.connect(DATABASE_PATH)
+    else:
+        con = sqlite3.connect(DATABASE_PATH)
+    con.execute("PRAGMA foreign_keys = ON")  # Enable foreign key constraints
+    con.row_factory = sqlite3.Row  # Enable dict-like access to rows
+    return con
+
+
+def get_request_profile():
+    """
+    Get the profile of the current request.
+    
+    Returns:
+        request_profiler.RequestProfile: Active profile, or None when the
+        request is not profiled or there is no request
+    """
+    if not has_request_context():
+        return None
+    return g.get('request_profile')
+
+
+# Derived schema created on startup. usage_counters holds, per platform, step
+# and feedback definition, how many applications use it; the triggers keep it
+# up to date on every write so the counts never need a COUNT scan.
+DERIVED_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS usage_counters (
+        kind TEXT NOT NULL,
+        definition_id INTEGER NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (kind, definition_id)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_steps_application_step
+        ON steps (application_id, step_id);
+
+    -- Platform and feedback usage: one per application
+    CREATE TRIGGER IF NOT EXISTS usage_applications_insert
+    AFTER INSERT ON applications
+    BEGIN
+        INSERT INTO usage_counters (kind, definition_id, count)
+        SELECT 'platform', NEW.platform_id, 1 WHERE NEW.platform_id IS NOT NULL
+        ON CONFLICT (kind, definition_id) DO UPDATE SET count = count + 1;
+        INSERT INTO usage_counters (kind, definition_id, count)
+        SELECT 'feedback', NEW.feedback_id, 1 WHERE NEW.feedback_id IS NOT NULL
+        ON CONFLICT (kind, definition_id) DO UPDATE SET count = count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS usage_applications_delete
+    AFTER DELETE ON applications
+    BEGIN
+        UPDATE usage_counters SET count = count - 1
+        WHERE kind = 'platform' AND definition_id = OLD.platform_id;
+        UPDATE usage_counters SET count = count - 1
+        WHERE kind = 'feedback' AND definition_id = OLD.feedback_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS usage_applications_update_platform
+    AFTER UPDATE OF platform_id ON applications
+    WHEN OLD.platform_id IS NOT NEW.platform_id
+    BEGIN
+        UPDATE usage_counters SET count = count - 1
+        WHERE kind = 'platform' AND definition_id = OLD.platform_id;
+        INSERT INTO usage_counters (kind, definition_id, count)
+        SELECT 'platform', NEW.platform_id, 1 WHERE NEW.platform_id IS NOT NULL
+        ON CONFLICT (kind, definition_id) DO UPDATE SET count = count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS usage_applications_update_feedback
+    AFTER UPDATE OF feedback_id ON applications
+    WHEN OLD.feedback_id IS NOT NEW.feedback_id
+    BEGIN
+        UPDATE usage_counters SET count = count - 1
+        WHERE kind = 'feedback' AND definition_id = OLD.feedback_id;
+        INSERT INTO usage_counters (kind, definition_id, count)
+        SELECT 'feedback', NEW.feedback_id, 1 WHERE NEW.feedback_id IS NOT NULL
+        ON CONFLICT (kind, definition_id) DO UPDATE SET count = count + 1;
+    END;
+
+    -- Step usage: distinct applications that went through the step
+    CREATE TRIGGER IF NOT EXISTS usage_steps_insert
+    AFTER INSERT ON steps
+    BEGIN
+        INSERT INTO usage_counters (kind, definition_id, count)
+        SELECT 'step', NEW.step_id, 1
+        WHERE NEW.step_id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM steps
+            WHERE application_id = NEW.application_id
+              AND step_id = NEW.step_id AND id != NEW.id
+        )
+        ON CONFLICT (kind, definition_id) DO UPDATE SET count = count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS usage_steps_delete
+    AFTER DELETE ON steps
+    BEGIN
+        UPDATE usage_counters SET count = count - 1
+        WHERE kind = 'step' AND definition_id = OLD.step_id AND NOT EXISTS (
+            SELECT 1 FROM steps
+            WHERE application_id = OLD.application_id AND step_id = OLD.step_id
+        );
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS usage_steps_update
+    AFTER UPDATE OF application_id, step_id ON steps
+    WHEN OLD.application_id IS NOT NEW.application_id OR OLD.step_id IS NOT NEW.step_id
+    BEGIN
+        UPDATE usage_counters SET count = count - 1
+        WHERE kind = 'step' AND definition_id = OLD.step_id AND NOT EXISTS (
+            SELECT 1 FROM steps
+            WHERE application_id = OLD.application_id AND step_id = OLD.step_id
+        );
+        INSERT INTO usage_counters (kind, definition_id, count)
+        SELECT 'step', NEW.step_id, 1
+        WHERE NEW.step_id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM steps
+            WHERE application_id = NEW.application_id
+              AND step_id = NEW.step_id AND id != NEW.id
+        )
+        ON CONFLICT (kind, definition_id) DO UPDATE SET count = count + 1;
+    END;
+
+    -- Dashboard totals of the archived applications, updated by every
+    -- archive batch so home() never has to scan the archive
+    CREATE TABLE IF NOT EXISTS archive_summary (
+        metric TEXT NOT NULL,
+        key TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        total_days INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (metric, key)
+    );
+
+    -- Bumped by every archive batch. Archive runs can come from another
+    -- process (flask archive-applications) that the in-process data
+    -- version never hears about, so servers poll this row instead
+    CREATE TABLE IF NOT EXISTS archive_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO archive_version (id, version) VALUES (1, 0);
+
+    -- Salary columns of the archived applications, copied by every archive
+    -- batch. Percentiles cannot be merged from totals, so the salary
+    -- analytics read these rows next to the hot applications.
+    CREATE TABLE IF NOT EXISTS archive_salaries (
+        id INTEGER PRIMARY KEY,
+        salary_range_min INTEGER,
+        salary_range_max INTEGER,
+        expected_salary INTEGER,
+        salary_offer INTEGER,
+        platform_id INTEGER,
+        mode TEXT,
+        role TEXT
+    );
+"""
+
+
+def init_database():
+    """
+    Create the derived tables, indexes and triggers if they are missing and
+    rebuild the usage counters from the current data.
+    
+    Rebuilding on startup keeps the counters correct even if the database
+    was modified while the triggers did not exist yet.
+    """
+    con = get_database_connection()
+    con.executescript(DERIVED_SCHEMA)
+
+    # Archives created before archive_salaries existed
+    if os.path.exists(ARCHIVE_DATABASE_PATH):
+        attach_archive(con)
+        con.execute(f"""
+            INSERT OR IGNORE INTO archive_salaries ({ARCHIVE_SALARY_COLUMNS})
+            SELECT {ARCHIVE_SALARY_COLUMNS} 
+            FROM archive.applications
+        """)
+
+    con.execute("DELETE FROM usage_counters")
+    con.execute("""
+        INSERT INTO usage_counters (kind, definition_id, count)
+        SELECT 'platform', platform_id, COUNT(*) 
+        FROM applications 
+        WHERE platform_id IS NOT NULL 
+        GROUP BY platform_id
+    """)
+    con.execute("""
+        INSERT INTO usage_counters (kind, definition_id, count)
+        SELECT 'step', step_id, COUNT(DISTINCT application_id) 
+        FROM steps 
+        WHERE step_id IS NOT NULL 
+        GROUP BY step_id
+    """)
+    con.execute("""
+        INSERT INTO usage_counters (kind, definition_id, count)
+        SELECT 'feedback', feedback_id, COUNT(*) 
+        FROM applications 
+        WHERE feedback_id IS NOT NULL 
+        GROUP BY feedback_id
+    """)
+
+    con.commit()
+    
+    # Archive runs before this start are already part of the data read
+    application_data_state['archive_version'] = get_archive_version(con.cursor())
+    
+    con.close()
+
+
+def get_usage_counts():
+    """
+    Get how many applications use each platform, step and feedback definition.
+    
+    Archived applications are included through their archive summary, since
+    deleting a definition deletes them too.
+    
+    Returns:
+        dict: 'platforms', 'steps' and 'feedbacks', each mapping a
+        definition id to its application count
+    """
+    con = get_database_connection()
+    cur = con.cursor()
+
+    cur.execute("SELECT kind, definition_id, count FROM usage_counters")
+    rows = cur.fetchall()
+    
+    cur.execute("""
+        SELECT metric as kind, key as definition_id, count 
+        FROM archive_summary 
+        WHERE metric IN ('platform', 'step', 'feedback')
+    """)
+    archived_rows = cur.fetchall()
+
+    con.close()
+
+    counts = {'platforms': {}, 'steps': {}, 'feedbacks': {}}
+    for row in rows:
+        counts[row['kind'] + 's'][row['definition_id']] = row['count']
+    for row in archived_rows:
+        if row['definition_id'].isdigit():
+            kind_counts = counts[row['kind'] + 's']
+            definition_id = int(row['definition_id'])
+            kind_counts[definition_id] = kind_counts.get(definition_id, 0) + row['count']
+    return counts
+
+
+def get_usage_count(kind, definition_id):
+    """
+    Get how many applications use a single definition, archived ones
+    included.
+    
+    Args:
+        kind (str): 'platform', 'step' or 'feedback'
+        definition_id (int): ID of the definition
+        
+    Returns:
+        int: Application count (0 when the definition was never used)
+    """
+    con = get_database_connection()
+    cur = con.cursor()
+
+    cur.execute("""
+        SELECT 
+            COALESCE((
+                SELECT count 
+                FROM usage_counters 
+                WHERE kind = ? AND definition_id = ?
+            ), 0) + COALESCE((
+                SELECT count 
+                FROM archive_summary 
+                WHERE metric = ? AND key = ?
+            ), 0) as count
+    """, (kind, definition_id, kind, str(definition_id)))
+    count = cur.fetchone()['count']
+
+    con.close()
+
+    return count
+
+
+# In-memory cache for the reference tables (platforms, steps_definition and
+# feedbacks_definition). They are tiny and only change through the /platforms
+# and /settings routes, which bump the version to force a reload.
+reference_data_lock = threading.Lock()
+reference_data_cache = {'version': 0, 'data': None}
+
+
+def invalidate_reference_data():
+    """
+    Mark the cached reference data as stale.
+    
+    Must be called after committing any write to platforms,
+    steps_definition or feedbacks_definition.
+    """
+    with reference_data_lock:
+        reference_data_cache['version'] += 1
+
+    # Names, colors or the list of definitions changed on the dashboard
+    publish_dashboard_event('resync')
+
+
+def get_reference_data():
+    """
+    Get platforms, step definitions and feedback definitions from the
+    in-memory cache, reloading them from the database when stale.
+    
+    Returns:
+        dict: Lists 'platforms', 'steps_definition' and 'feedbacks_definition'
+        plus id lookups 'platforms_by_id', 'steps_by_id' and 'feedbacks_by_id'
+    """
+    with reference_data_lock:
+        data = reference_data_cache['data']
+        version = reference_data_cache['version']
+        if data is not None and data['version'] == version:
+            return data
+
+        con = get_database_connection()
+        cur = con.cursor()
+
+        cur.execute("SELECT * FROM platforms")
+        platforms = [dict(row) for row in cur.fetchall()]
+
+        cur.execute("SELECT * FROM steps_definition")
+        steps_definition = [dict(row) for row in cur.fetchall()]
+
+        cur.execute("SELECT * FROM feedbacks_definition")
+        feedbacks_definition = [dict(row) for row in cur.fetchall()]
+
+        con.close()
+
+        data = {
+            'version': version,
+            'platforms': platforms,
+            'steps_definition': steps_definition,
+            'feedbacks_definition': feedbacks_definition,
+            'platforms_by_id': {row['id']: row for row in platforms},
+            'steps_by_id': {row['id']: row for row in steps_definition},
+            'feedbacks_by_id': {row['id']: row for row in feedbacks_definition}
+        }
+        reference_data_cache['data'] = data
+        return data
+
+
+# Open dashboards subscribed to Server-Sent Events, one queue each. Write
+# routes publish small analytics deltas that are fanned out to every queue.
+dashboard_subscribers_lock = threading.Lock()
+dashboard_subscribers = set()
+
+# Seconds between keep-alive comments on idle event streams
+SSE_HEARTBEAT_SECONDS = 15
+
+# Undelivered events kept per dashboard before it is told to resync
+SSE_QUEUE_SIZE = 100
+
+
+def publish_dashboard_event(event_type, data=None, version=None):
+    """
+    Push an analytics delta to every open dashboard.
+    
+    The event id is the dashboard version the delta brings the dashboard
+    to, so it can tell whether it missed any event when it reconnects.
+    
+    Args:
+        event_type (str): 'application_created', 'application_updated',
+            'step_reached', 'application_finalized', 'steps_reached' (a
+            bulk update), 'step_updated', 'step_removed' or 'resync'
+            (reload everything)
+        data (dict): JSON serializable event payload
+        version (str): Dashboard version after the change (defaults to
+            the current one)
+    """
+    if version is None:
+        version = get_dashboard_version()
+    message = f"id: {version}\nevent: {event_type}\ndata: {json.dumps(data or {})}\n\n"
+
+    with dashboard_subscribers_lock:
+        subscribers = list(dashboard_subscribers)
+
+    for subscriber in subscribers:
+        try:
+            subscriber.put_nowait(message)
+        except queue.Full:
+            # The dashboard fell behind; drop its backlog and make it reload
+            with subscriber.mutex:
+                subscriber.queue.clear()
+            subscriber.put_nowait("event: resync\ndata: {}\n\n")
+
+
+# Version of the applications and steps data. Every route that writes them
+# bumps it, so analytics derived from those tables can be cached per version.
+application_data_lock = threading.Lock()
+application_data_state = {'version': 0, 'archive_version': None}
+
+# Identifies this server process in dashboard versions, since the in-memory
+# versions start over after a restart
+SERVER_INSTANCE = os.urandom(4).hex()
+
+
+def get_dashboard_version():
+    """
+    Get the version of everything a dashboard shows.
+    
+    home() renders it into the page and /events sends it first on every
+    (re)connection; a dashboard whose version differs missed events and
+    reloads.
+    
+    Returns:
+        str: Server instance, application data version and reference
+        data version
+    """
+    return '%s-%d-%d' % (
+        SERVER_INSTANCE, application_data_state['version'], reference_data_cache['version']
+    )
+
+
+def application_data_changed(event_type='resync', data=None):
+    """
+    Mark analytics derived from applications and steps as stale and
+    notify open dashboards.
+    
+    Must be called after committing any write to applications or steps.
+    
+    Args:
+        event_type (str): Dashboard event describing the change; writes
+            without an incremental delta make dashboards resync
+        data (dict): Event payload
+    """
+    with application_data_lock:
+        application_data_state['version'] += 1
+        version = get_dashboard_version()
+
+    publish_dashboard_event(event_type, data, version)
+
+
+def get_archive_version(cur):
+    """
+    Get the stored archive version.
+    
+    Args:
+        cur (sqlite3.Cursor): Open database cursor
+        
+    Returns:
+        int: Version bumped by every archive batch
+    """
+    cur.execute("SELECT version FROM archive_version WHERE id = 1")
+    return cur.fetchone()['version']
+
+
+def check_archive_version():
+    """
+    Detect archive runs committed since the last check, including the ones
+    of other processes such as the archive-applications command, and mark
+    the data changed when there were any.
+    
+    Called before serving cached analytics and periodically by every
+    dashboard event stream, so caches and open dashboards catch up without
+    a server restart.
+    """
+    con = get_database_connection()
+    archive_version = get_archive_version(con.cursor())
+    con.close()
+    
+    with application_data_lock:
+        changed = archive_version != application_data_state['archive_version']
+        application_data_state['archive_version'] = archive_version
+    
+    if changed:
+        application_data_changed()
+
+
+def get_step_delta(cur, application_id, step_id, step_date):
+    """
+    Collect what the dashboard needs to apply a new step incrementally.
+    
+    Must run before the step is inserted and the application updated.
+    
+    Args:
+        cur (sqlite3.Cursor): Cursor on the write connection
+        application_id (int): ID of the application
+        step_id (str): Step definition being reached
+        step_date (str): Date of the step
+        
+    Returns:
+        dict: previous_last_step, days since the application date and
+        whether the application reached this step before (None if the
+        application does not exist)
+    """
+    return get_step_deltas(cur, [application_id], step_id, step_date).get(int(application_id))
+
+
+def get_step_deltas(cur, application_ids, step_id, step_date):
+    """
+    Collect the dashboard deltas of several applications reaching the same
+    step in a single query. Must run before the writes.
+    
+    Args:
+        cur (sqlite3.Cursor): Cursor on the write connection
+        application_ids (list): IDs of the applications
+        step_id (str): Step definition being reached
+        step_date (str): Date of the step
+        
+    Returns:
+        dict: Application id to its delta (see get_step_delta); missing
+        applications are left out
+    """
+    if not application_ids:
+        return {}
+    
+    placeholders = ', '.join('?' * len(application_ids))
+    cur.execute(f"""
+        SELECT 
+            a.id,
+            a.last_step as previous_last_step,
+            CAST((julianday(?) - julianday(a.application_date)) AS INTEGER) as days,
+            EXISTS (
+                SELECT 1 FROM steps s 
+                WHERE s.application_id = a.id AND s.step_id = ?
+            ) as reached_before
+        FROM applications a 
+        WHERE a.id IN ({placeholders})
+    """, (step_date, step_id, *application_ids))
+    
+    deltas = {}
+    for row in cur.fetchall():
+        delta = dict(row)
+        deltas[delta.pop('id')] = delta
+    return deltas
+
+
+def build_step_event(application_id, step_id, delta):
+    """
+    Build the dashboard payload for a step reached by an application.
+    
+    Args:
+        application_id (int): ID of the application
+        step_id (str): Step definition reached (validated by the insert)
+        delta (dict): Result of get_step_delta
+        
+    Returns:
+        dict: Event payload
+    """
+    step_id = int(step_id)
+    return {
+        'application_id': application_id,
+        'step_id': step_id,
+        'first_time': not delta['reached_before'],
+        'previous_last_step': delta['previous_last_step'],
+        # Average days per step ignores the initial application step
+        'days': delta['days'] if step_id != 1 else None
+    }
+
+
+def get_application_delta(cur, application_id):
+    """
+    Collect the dashboard state of an application: what its platform,
+    mode and trend rows count and the days of each of its steps.
+
+    Called before and after an edit, so the dashboard can move the
+    application between rows instead of reloading.
+
+    Args:
+        cur (sqlite3.Cursor): Cursor on the write connection
+        application_id (int): ID of the application
+
+    Returns:
+        dict: platform_id, mode, application_date, in_trend and step_days
+        (step record id to step definition and days), or None if the
+        application does not exist
+    """
+    cur.execute("""
+        SELECT
+            platform_id,
+            mode,
+            application_date,
+            application_date >= date('now', '-1 months') as in_trend
+        FROM applications
+        WHERE id = ?
+    """, (application_id,))
+    application = cur.fetchone()
+    if application is None:
+        return None
+
+    delta = dict(application)
+    cur.execute("""
+        SELECT
+            s.id,
+            s.step_id,
+            CAST((julianday(s.step_date) - julianday(a.application_date)) AS INTEGER) as days
+        FROM steps s
+        JOIN applications a ON a.id = s.application_id
+        WHERE s.application_id = ? AND s.step_id != 1
+    """, (application_id,))
+    delta['step_days'] = {row['id']: (row['step_id'], row['days']) for row in cur.fetchall()}
+    return delta
+
+
+def build_update_event(application_id, before, after):
+    """
+    Build the dashboard payload for an edited application.
+
+    Args:
+        application_id (int): ID of the application
+        before (dict): Result of get_application_delta before the update
+        after (dict): Result of get_application_delta after the update
+
+    Returns:
+        dict: Event payload with the old and new platform, mode and trend
+        date, plus the steps whose days changed with the application date
+    """
+    platforms_by_id = get_reference_data()['platforms_by_id']
+
+    def rows(delta):
+        return {
+            'platform_name': platforms_by_id.get(delta['platform_id'], {}).get('name'),
+            'mode': delta['mode'],
+            'application_date': delta['application_date'],
+            'in_trend': bool(delta['in_trend'])
+        }
+
+    return {
+        'application_id': application_id,
+        'before': rows(before),
+        'after': rows(after),
+        'step_days': [
+            {'step_id': step_id, 'before': days, 'after': after['step_days'][record_id][1]}
+            for record_id, (step_id, days) in before['step_days'].items()
+            if after['step_days'][record_id][1] != days
+        ]
+    }
+
+
+def get_step_record_delta(cur, application_id, record_id):
+    """
+    Collect what the dashboard counts for a single step record.
+
+    Args:
+        cur (sqlite3.Cursor): Cursor on the write connection
+        application_id (int): ID of the application
+        record_id (int): ID of the step record
+
+    Returns:
+        dict: step_id, days since the application date and whether the
+        application has another record of the same step (None if the
+        record does not exist)
+    """
+    cur.execute("""
+        SELECT
+            s.step_id,
+            CAST((julianday(s.step_date) - julianday(a.application_date)) AS INTEGER) as days,
+            EXISTS (
+                SELECT 1 FROM steps other
+                WHERE other.application_id = s.application_id
+                  AND other.step_id = s.step_id
+                  AND other.id != s.id
+            ) as reached_elsewhere
+        FROM steps s
+        LEFT JOIN applications a ON a.id = s.application_id
+        WHERE s.application_id = ? AND s.id = ?
+    """, (application_id, record_id))
+    record = cur.fetchone()
+    return dict(record) if record else None
+
+
+def build_step_record_event(record):
+    """
+    Build the part of a dashboard payload describing one step record.
+
+    Args:
+        record (dict): Result of get_step_record_delta (integer step_id)
+
+    Returns:
+        dict: step_id, whether it is the application's only record of that
+        step and its days (None for the initial application step)
+    """
+    step_id = record['step_id']
+    return {
+        'step_id': step_id,
+        'only_record': not record['reached_elsewhere'],
+        'days': record['days'] if step_id != 1 else None
+    }
+
+
+def load_salary_analytics():
+    """
+    Get the salary analytics for the current data version.
+    
+    The cache key includes the reference data version because platform
+    names are part of the result.
+    
+    Returns:
+        dict: Salary histograms, offer ratios and percentile bands
+    """
+    # Archive runs of other processes change the data too
+    check_archive_version()
+    
+    reference = get_reference_data()
+    version = (application_data_state['version'], reference['version'])
+    platform_names = {
+        platform_id: platform['name'] 
+        for platform_id, platform in reference['platforms_by_id'].items()
+    }
+    return salary_analytics.get_salary_analytics(
+        get_database_connection, version, platform_names
+    )
+
+
+# Schema of the attached archive database. Rows keep their original ids,
+# which AUTOINCREMENT never reuses in the main database.
+ARCHIVE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS archive.applications (
+        id INTEGER PRIMARY KEY,
+        application_date DATETIME,
+        company TEXT,
+        role TEXT,
+        platform_id INTEGER,
+        salary_range_min INTEGER,
+        salary_range_max INTEGER,
+        expected_salary INTEGER,
+        salary_offer INTEGER,
+        last_step INTEGER,
+        last_step_date DATETIME,
+        mode TEXT,
+        feedback_id INTEGER,
+        feedback_date DATETIME,
+        observation TEXT,
+        archived_at DATETIME
+    );
+
+    CREATE TABLE IF NOT EXISTS archive.steps (
+        id INTEGER PRIMARY KEY,
+        application_id INTEGER,
+        step_id INTEGER,
+        observation TEXT,
+        step_date DATETIME
+    );
+
+    CREATE INDEX IF NOT EXISTS archive.idx_archive_steps_application
+        ON steps (application_id);
+"""
+
+APPLICATION_COLUMNS = """
+    id, application_date, company, role, platform_id, salary_range_min, 
+    salary_range_max, expected_salary, salary_offer, last_step, last_step_date, 
+    mode, feedback_id, feedback_date, observation
+"""
+
+# Columns copied to archive_salaries for the salary analytics
+ARCHIVE_SALARY_COLUMNS = """
+    id, salary_range_min, salary_range_max, expected_salary, salary_offer, 
+    platform_id, mode, role
+"""
+
+# Archive summary updates for the applications in archive_batch. Each one
+# adds the batch totals to the metric, keyed by definition id or mode. They
+# are formatted with the schema holding the batch ('main' when archiving,
+# 'archive' when archived applications are deleted) and the sign of the
+# totals ('+' to add them, '-' to subtract them).
+ARCHIVE_SUMMARY_QUERIES = [
+    # Total applications
+    """
+    INSERT INTO archive_summary (metric, key, count)
+    SELECT 'applications', '', {sign}COUNT(*) 
+    FROM {schema}.applications 
+    WHERE id IN (SELECT id FROM archive_batch)
+    ON CONFLICT (metric, key) DO UPDATE SET count = count + excluded.count
+    """,
+    # Applications per platform, feedback, mode and last step (offers and denials)
+    """
+    INSERT INTO archive_summary (metric, key, count)
+    SELECT 'platform', platform_id, {sign}COUNT(*) 
+    FROM {schema}.applications 
+    WHERE id IN (SELECT id FROM archive_batch) AND platform_id IS NOT NULL
+    GROUP BY platform_id
+    ON CONFLICT (metric, key) DO UPDATE SET count = count + excluded.count
+    """,
+    """
+    INSERT INTO archive_summary (metric, key, count)
+    SELECT 'feedback', feedback_id, {sign}COUNT(*) 
+    FROM {schema}.applications 
+    WHERE id IN (SELECT id FROM archive_batch) AND feedback_id IS NOT NULL
+    GROUP BY feedback_id
+    ON CONFLICT (metric, key) DO UPDATE SET count = count + excluded.count
+    """,
+    """
+    INSERT INTO archive_summary (metric, key, count)
+    SELECT 'mode', COALESCE(mode, ''), {sign}COUNT(*) 
+    FROM {schema}.applications 
+    WHERE id IN (SELECT id FROM archive_batch)
+    GROUP BY COALESCE(mode, '')
+    ON CONFLICT (metric, key) DO UPDATE SET count = count + excluded.count
+    """,
+    """
+    INSERT INTO archive_summary (metric, key, count)
+    SELECT 'last_step', last_step, {sign}COUNT(*) 
+    FROM {schema}.applications 
+    WHERE id IN (SELECT id FROM archive_batch) AND last_step IS NOT NULL
+    GROUP BY last_step
+    ON CONFLICT (metric, key) DO UPDATE SET count = count + excluded.count
+    """,
+    # Distinct applications that went through each step
+    """
+    INSERT INTO archive_summary (metric, key, count)
+    SELECT 'step', step_id, {sign}COUNT(DISTINCT application_id) 
+    FROM {schema}.steps 
+    WHERE application_id IN (SELECT id FROM archive_batch) AND step_id IS NOT NULL
+    GROUP BY step_id
+    ON CONFLICT (metric, key) DO UPDATE SET count = count + excluded.count
+    """,
+    # Days from application to each step, as a sum and a sample count
+    """
+    INSERT INTO archive_summary (metric, key, count, total_days)
+    SELECT 
+        'step_days', 
+        s.step_id, 
+        {sign}COUNT(julianday(s.step_date) - julianday(a.application_date)),
+        {sign}COALESCE(SUM(CAST((julianday(s.step_date) - julianday(a.application_date)) AS INTEGER)), 0)
+    FROM {schema}.steps s
+    JOIN {schema}.applications a ON a.id = s.application_id
+    WHERE s.application_id IN (SELECT id FROM archive_batch) AND s.step_id != 1
+    GROUP BY s.step_id
+    ON CONFLICT (metric, key) DO UPDATE SET 
+        count = count + excluded.count, 
+        total_days = total_days + excluded.total_days
+    """
+]
+
+
+def attach_archive(con):
+    """
+    Attach the archive database as 'archive', creating its tables if needed.
+    
+    Args:
+        con (sqlite3.Connection): Connection outside of a transaction
+    """
+    con.execute("ATTACH DATABASE ? AS archive", (ARCHIVE_DATABASE_PATH,))
+    con.executescript(ARCHIVE_SCHEMA)
+
+
+def archive_applications(after_days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move finalized applications (Offer or Denied) whose last step is older
+    than after_days, with their steps, into the archive database.
+    
+    Applications are moved in batches, each in its own transaction that
+    copies the rows, adds them to archive_summary, keeps their salary
+    columns in archive_salaries and deletes them from the hot tables, so the write lock is only held for one batch at a time.
+    Applications from the last month are never archived because the
+    dashboard trend only reads hot data.
+    
+    Args:
+        after_days (int): Minimum age in days of the final step
+        batch_size (int): Applications moved per transaction
+        
+    Returns:
+        int: Number of archived applications
+    """
+    con = get_database_connection()
+    attach_archive(con)
+    cur = con.cursor()
+    
+    cur.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+    
+    archived = 0
+    while True:
+        cur.execute("BEGIN IMMEDIATE")
+        
+        # Select the next batch of old finalized applications
+        cur.execute("DELETE FROM archive_batch")
+        cur.execute("""
+            INSERT INTO archive_batch (id)
+            SELECT id 
+            FROM applications 
+            WHERE last_step IN (6, 7)
+              AND last_step_date < date('now', ?)
+              AND application_date < date('now', '-1 months')
+            ORDER BY id
+            LIMIT ?
+        """, ('-%d days' % after_days, batch_size))
+        batch_count = cur.rowcount
+        
+        if batch_count == 0:
+            con.rollback()
+            break
+        
+        # Copy applications and steps; REPLACE keeps a retried batch idempotent
+        cur.execute(f"""
+            INSERT OR REPLACE INTO archive.applications ({APPLICATION_COLUMNS}, archived_at)
+            SELECT {APPLICATION_COLUMNS}, datetime('now') 
+            FROM applications 
+            WHERE id IN (SELECT id FROM archive_batch)
+        """)
+        cur.execute("""
+            INSERT OR REPLACE INTO archive.steps (id, application_id, step_id, observation, step_date)
+            SELECT id, application_id, step_id, observation, step_date 
+            FROM steps 
+            WHERE application_id IN (SELECT id FROM archive_batch)
+        """)
+        
+        # Add the batch to the dashboard summaries and keep its salaries
+        for query in ARCHIVE_SUMMARY_QUERIES:
+            cur.execute(query.format(schema='main', sign='+'))
+        cur.execute(f"""
+            INSERT OR REPLACE INTO archive_salaries ({ARCHIVE_SALARY_COLUMNS})
+            SELECT {ARCHIVE_SALARY_COLUMNS} 
+            FROM applications 
+            WHERE id IN (SELECT id FROM archive_batch)
+        """)
+        cur.execute("UPDATE archive_version SET version = version + 1 WHERE id = 1")
+        
+        # Remove the batch from the hot tables (usage counters follow via triggers)
+        cur.execute("DELETE FROM steps WHERE application_id IN (SELECT id FROM archive_batch)")
+        cur.execute("DELETE FROM applications WHERE id IN (SELECT id FROM archive_batch)")
+        
+        con.commit()
+        archived += batch_count
+    
+    con.close()
+    
+    # Picks up the batches above (and those of any concurrent run)
+    check_archive_version()
+    
+    return archived
+
+
+# Archived applications using a definition, by definition kind, and the
+# archive summary metrics keyed by that definition's id
+ARCHIVED_USAGE = {
+    'platform': (
+        "SELECT id FROM archive.applications WHERE platform_id = ?",
+        ('platform',)
+    ),
+    'step': (
+        "SELECT DISTINCT application_id FROM archive.steps WHERE step_id = ?",
+        ('step', 'step_days', 'last_step')
+    ),
+    'feedback': (
+        "SELECT id FROM archive.applications WHERE feedback_id = ?",
+        ('feedback',)
+    )
+}
+
+
+def delete_archived_applications(con, kind, definition_id):
+    """
+    Delete the archived applications that use a definition, with their
+    steps, and remove them from archive_summary and archive_salaries.
+    
+    Definition ids can be reused after a delete, so nothing archived may
+    keep pointing at a deleted definition. Must be called before the
+    route's own writes: the archive is attached outside of a transaction
+    and the deletes then join the route's transaction, which commits both
+    databases atomically.
+    
+    Args:
+        con (sqlite3.Connection): Write connection of the route
+        kind (str): 'platform', 'step' or 'feedback'
+        definition_id (int): ID of the definition being deleted
+    """
+    # Nothing was ever archived
+    if not os.path.exists(ARCHIVE_DATABASE_PATH):
+        return
+    
+    attach_archive(con)
+    cur = con.cursor()
+    select_applications, metrics = ARCHIVED_USAGE[kind]
+    
+    cur.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+    cur.execute("DELETE FROM archive_batch")
+    cur.execute(f"INSERT INTO archive_batch (id) {select_applications}", (definition_id,))
+    
+    # Subtract the applications from every summary, then drop the emptied
+    # entries and whatever is still keyed by the deleted definition
+    for query in ARCHIVE_SUMMARY_QUERIES:
+        cur.execute(query.format(schema='archive', sign='-'))
+    cur.execute("DELETE FROM archive_summary WHERE count <= 0")
+    placeholders = ', '.join('?' * len(metrics))
+    cur.execute(f"""
+        DELETE FROM archive_summary 
+        WHERE metric IN ({placeholders}) AND key = ?
+    """, (*metrics, str(definition_id)))
+    
+    cur.execute("DELETE FROM archive_salaries WHERE id IN (SELECT id FROM archive_batch)")
+    cur.execute("DELETE FROM archive.steps WHERE application_id IN (SELECT id FROM archive_batch)")
+    cur.execute("DELETE FROM archive.applications WHERE id IN (SELECT id FROM archive_batch)")
+
+
+def get_archive_summary(cur):
+    """
+    Get the precomputed totals of the archived applications.
+    
+    Args:
+        cur (sqlite3.Cursor): Open database cursor
+        
+    Returns:
+        dict: Metric name to {key: (count, total_days)}
+    """
+    cur.execute("SELECT metric, key, count, total_days FROM archive_summary")
+    
+    summary = {}
+    for row in cur.fetchall():
+        summary.setdefault(row['metric'], {})[row['key']] = (row['count'], row['total_days'])
+    return summary
+
+
+def load_archived_applications():
+    """
+    Get the archived applications with their step history, newest first.
+    
+    Steps are read in one query and grouped in Python.
+    
+    Returns:
+        list: Archived applications as dicts with a 'steps' list and
+        'archived_at'; empty if nothing was archived yet
+    """
+    if not os.path.exists(ARCHIVE_DATABASE_PATH):
+        return []
+    
+    con = get_database_connection()
+    attach_archive(con)
+    cur = con.cursor()
+    
+    cur.execute("""
+        SELECT * 
+        FROM archive.applications 
+        ORDER BY application_date DESC
+    """)
+    applications = [dict(row) for row in cur.fetchall()]
+    
+    cur.execute("""
+        SELECT * 
+        FROM archive.steps 
+        ORDER BY application_id, step_date ASC
+    """)
+    steps_by_application = {}
+    for step in cur.fetchall():
+        steps_by_application.setdefault(step['application_id'], []).append(dict(step))
+    
+    con.close()
+    
+    for application in applications:
+        application['steps'] = steps_by_application.get(application['id'], [])
+    return applications
+
+
+def wants_partial():
+    """
+    Check whether the current write was sent by the applications page
+    script, which patches the DOM instead of following a redirect.
+    
+    Returns:
+        bool: True for AJAX requests (X-Requested-With: XMLHttpRequest)
+    """
+    return request.headers.get('X-Requested-With') == 'XMLHttpRequest'
 
-def get_database_connection():
+
+def load_application_steps(cur, application_id):
     """
-    Establishes a connection to the SQLite database.
+    Get the step history of an application.
     
+    Args:
+        cur (sqlite3.Cursor): Open database cursor
+        application_id (int): ID of the application
+        
     Returns:
-        sqlite3.Connection: Database connection with foreign keys enabled
-        and row factory set to sqlite3.Row for dict-like access
+        list: Step records as dicts, oldest first (step details come
+        from the reference data cache)
     """
-    con = sqlite3.connect(DATABASE_PATH)
-    con.execute("PRAGMA foreign_keys = ON")  # Enable foreign key constraints
-    con.row_factory = sqlite3.Row  # Enable dict-like access to rows
-    return con
+    cur.execute("""
+        SELECT * 
+        FROM steps 
+        WHERE application_id = ?
+        ORDER BY step_date ASC
+    """, (application_id,))
+    return [dict(step) for step in cur.fetchall()]
+
+
+def load_application(cur, application_id):
+    """
+    Get a single application with its complete step history.
+    
+    Args:
+        cur (sqlite3.Cursor): Open database cursor
+        application_id (int): ID of the application
+        
+    Returns:
+        dict: Application with a 'steps' list, or None if it does not exist
+    """
+    cur.execute("SELECT * FROM applications WHERE id = ?", (application_id,))
+    application = cur.fetchone()
+    if application is None:
+        return None
+
+    application = dict(application)
+    application['steps'] = load_application_steps(cur, application_id)
+    return application
+
+
+def load_applications(cur, application_ids):
+    """
+    Get several applications with their step histories in two queries.
+    
+    Args:
+        cur (sqlite3.Cursor): Open database cursor
+        application_ids (list): IDs of the applications
+        
+    Returns:
+        dict: Application id to application with a 'steps' list; missing
+        applications are left out
+    """
+    if not application_ids:
+        return {}
+    
+    placeholders = ', '.join('?' * len(application_ids))
+    cur.execute(f"SELECT * FROM applications WHERE id IN ({placeholders})", application_ids)
+    applications = {row['id']: dict(row, steps=[]) for row in cur.fetchall()}
+    
+    cur.execute(f"""
+        SELECT * 
+        FROM steps 
+        WHERE application_id IN ({placeholders})
+        ORDER BY application_id, step_date ASC
+    """, application_ids)
+    for step in cur.fetchall():
+        if step['application_id'] in applications:
+            applications[step['application_id']]['steps'].append(dict(step))
+    
+    return applications
+
+
+def render_application_partial(application):
+    """
+    Render the response of an AJAX write: just the updated application
+    card, or the application as JSON when the client asks for it.
+    
+    The application is loaded by the route on its write connection before
+    committing, so the response shows exactly what was written and no
+    second connection is needed after the commit.
+    
+    Args:
+        application (dict): Result of load_application, or None
+        
+    Returns:
+        Response: Card HTML fragment or JSON, 404 if the application
+        does not exist
+    """
+    if application is None:
+        abort(404)
+    
+    if request.accept_mimetypes.best == 'application/json':
+        return {'application': application}
+    
+    return render_template('application_card.html', application=application)
+
+
+@app.context_processor
+def inject_reference_data():
+    """
+    Expose the cached reference data to every template as 'reference',
+    so names and colors can be resolved without SQL joins.
+    """
+    return {'reference': get_reference_data()}
+
+
+# Endpoints never profiled: static files, the long-lived event stream and
+# the profile pages themselves
+PROFILER_SKIPPED_ENDPOINTS = {'static', 'dashboard_events', 'profiles', 'profile_report'}
+
+
+@app.before_request
+def start_request_profile():
+    """
+    Start profiling the request when it has the X-Profile header or is
+    picked by the sampling rate. Only one request is profiled at a time.
+    """
+    if request.endpoint in PROFILER_SKIPPED_ENDPOINTS:
+        return
+    if not request_profiler.should_profile(request.headers):
+        return
+    if not request_profiler.profiler_lock.acquire(blocking=False):
+        return
+    
+    g.request_profile = request_profiler.RequestProfile(
+        request.method, request.full_path.rstrip('?')
+    )
+
+
+@app.after_request
+def tag_request_profile(response):
+    """
+    Remember the response status and expose the report id in the
+    X-Profile-Report header.
+    """
+    profile = get_request_profile()
+    if profile is not None:
+        g.request_profile_status = response.status_code
+        response.headers['X-Profile-Report'] = profile.id
+    return response
+
+
+@app.teardown_request
+def finish_request_profile(error=None):
+    """
+    Stop profiling and write the report once the request is done.
+    
+    Args:
+        error (Exception): Unhandled exception of the request, if any
+    """
+    profile = g.pop('request_profile', None)
+    if profile is None:
+        return
+    
+    try:
+        status_code = 500 if error is not None else g.get('request_profile_status', 200)
+        request_profiler.write_report(profile.finish(status_code))
+    finally:
+        request_profiler.profiler_lock.release()
 
 
 @app.route('/')
@@ -36,16 +1265,27 @@ def home():
     - Applications by mode (remote/hybrid/onsite)
     - Monthly application trends
     - Success metrics and average days per step
+    - Salary histograms, offer ratios and percentile bands
     
     Returns:
         str: Rendered home.html template with analytics data
     """
+    # Version read before the queries: a write committed while they run
+    # makes the live updates stream report a newer version
+    check_archive_version()
+    dashboard_version = get_dashboard_version()
+    
     con = get_database_connection()
     cur = con.cursor()
     
+    # Precomputed totals of the archived applications, merged into every
+    # metric below (the monthly trend never includes archived applications)
+    archive_summary = get_archive_summary(cur)
+    
     # Get total applications count
     cur.execute("SELECT COUNT(DISTINCT application_id) as total FROM steps")
     total_applications = cur.fetchone()['total']
+    total_applications += archive_summary.get('applications', {}).get('', (0, 0))[0]
 
     # Get applications count per step - this shows how many unique applications
     # have actually passed through each step (based on the steps history table)
@@ -60,7 +1300,9 @@ def home():
         GROUP BY sd.id, sd.name, sd.color
         ORDER BY sd.id
     """)
-    applications_per_step = cur.fetchall()
+    applications_per_step = [dict(step) for step in cur.fetchall()]
+    for step in applications_per_step:
+        step['applications_count'] += archive_summary.get('step', {}).get(str(step['step_id']), (0, 0))[0]
 
     # Calculate conversion rates for each step
     conversion_data = []
@@ -87,7 +1329,19 @@ def home():
         HAVING COUNT(a.id) > 0
         ORDER BY count DESC
     """)
-    applications_by_platform = cur.fetchall()
+    platform_counts = {row['platform_name']: row['count'] for row in cur.fetchall()}
+    
+    # Add archived applications of platforms that still exist
+    platforms_by_id = get_reference_data()['platforms_by_id']
+    for platform_id, (count, _) in archive_summary.get('platform', {}).items():
+        platform = platforms_by_id.get(int(platform_id))
+        if platform:
+            platform_counts[platform['name']] = platform_counts.get(platform['name'], 0) + count
+    
+    applications_by_platform = [
+        {'platform_name': name, 'count': count}
+        for name, count in sorted(platform_counts.items(), key=lambda item: -item[1])
+    ]
     
     # Get applications grouped by work mode (remote, hybrid, onsite)
     cur.execute("""
@@ -95,7 +1349,13 @@ def home():
         FROM applications
         GROUP BY mode
     """)
-    applications_by_mode = cur.fetchall()
+    mode_counts = {row['mode']: row['count'] for row in cur.fetchall()}
+    
+    # Archived applications without a mode are summarized under ''
+    for mode, (count, _) in archive_summary.get('mode', {}).items():
+        mode_counts[mode] = mode_counts.get(mode, 0) + count
+    
+    applications_by_mode = [{'mode': mode, 'count': count} for mode, count in mode_counts.items()]
     
     # Get daily applications for the last month
     cur.execute("""
@@ -113,9 +1373,11 @@ def home():
     # Assuming step 6 is "Offer" and step 7 is "Denied"
     cur.execute("SELECT COUNT(*) as offers FROM applications WHERE last_step = 6")
     total_offers = cur.fetchone()['offers']
+    total_offers += archive_summary.get('last_step', {}).get('6', (0, 0))[0]
     
     cur.execute("SELECT COUNT(*) as denials FROM applications WHERE last_step = 7")
     total_denials = cur.fetchone()['denials']
+    total_denials += archive_summary.get('last_step', {}).get('7', (0, 0))[0]
     
     # Calculate success rate as percentage of offers vs total applications
     success_rate = (
@@ -126,14 +1388,17 @@ def home():
     # Calculate average days from application to each step
     cur.execute("""
         SELECT 
+            sd.id as step_id,
             sd.name as step_name,
             sd.color as step_color,
-            COALESCE(savg.avg_days, 0) as avg_days
+            COALESCE(savg.avg_days, 0) as avg_days,
+            COALESCE(savg.samples, 0) as samples
         FROM steps_definition sd 
         LEFT JOIN (
             SELECT 
                 s.step_id, 
-                AVG(CAST((julianday(s.step_date) - julianday(a.application_date)) AS INTEGER)) as avg_days
+                AVG(CAST((julianday(s.step_date) - julianday(a.application_date)) AS INTEGER)) as avg_days,
+                COUNT(julianday(s.step_date) - julianday(a.application_date)) as samples
             FROM steps s
             LEFT JOIN applications a ON a.id = s.application_id
             WHERE s.step_id != 1  -- Exclude initial application step
@@ -141,10 +1406,21 @@ def home():
         ) as savg ON sd.id = savg.step_id
         ORDER BY sd.id
     """)
-    average_days_per_step = cur.fetchall()
+    average_days_per_step = [dict(step) for step in cur.fetchall()]
+    
+    # Weighted average of the hot and archived days per step
+    for step in average_days_per_step:
+        archived_samples, archived_days = archive_summary.get('step_days', {}).get(str(step['step_id']), (0, 0))
+        if archived_samples:
+            samples = step['samples'] + archived_samples
+            step['avg_days'] = (step['avg_days'] * step['samples'] + archived_days) / samples
+            step['samples'] = samples
     
     con.close()
     
+    # Salary analytics are cached until applications or platforms change
+    salary_data = load_salary_analytics()
+    
     # Render template with all analytics data
     return render_template(
         'home.html',
@@ -156,7 +1432,68 @@ def home():
         average_days_per_step=average_days_per_step,
         total_offers=total_offers,
         total_denials=total_denials,
-        success_rate=success_rate
+        success_rate=success_rate,
+        salary_analytics=salary_data,
+        dashboard_version=dashboard_version
+    )
+
+
+@app.route('/analytics/salary', methods=['GET'])
+def analytics_salary():
+    """
+    Salary analytics as JSON.
+    
+    Returns:
+        dict: JSON response with salary histograms, offered-vs-expected
+        ratios and percentile bands by platform, mode and role
+    """
+    return load_salary_analytics()
+
+
+@app.route('/events', methods=['GET'])
+def dashboard_events():
+    """
+    Server-Sent Events stream of dashboard analytics deltas.
+    
+    Each open dashboard holds one stream. Write routes publish small events
+    (new application, step reached, application finalized) that the
+    dashboard applies to its charts in place, or 'resync' when the change
+    cannot be applied incrementally. Every connection starts with a
+    'version' event so the dashboard can detect events it missed before
+    connecting or while reconnecting.
+    
+    Returns:
+        Response: text/event-stream response
+    """
+    def stream():
+        subscriber = queue.Queue(maxsize=SSE_QUEUE_SIZE)
+        with dashboard_subscribers_lock:
+            dashboard_subscribers.add(subscriber)
+        try:
+            # Ask the browser to wait 5 seconds before reconnecting
+            yield "retry: 5000\n\n"
+            
+            # Current version, read after subscribing so no change falls in
+            # between; the dashboard reloads if it missed anything
+            version = get_dashboard_version()
+            yield f"event: version\ndata: {json.dumps({'version': version})}\n\n"
+            while True:
+                try:
+                    yield subscriber.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    # Archive runs of other processes publish no events
+                    check_archive_version()
+                    
+                    # Keep-alive comment, also detects closed connections
+                    yield ": heartbeat\n\n"
+        finally:
+            with dashboard_subscribers_lock:
+                dashboard_subscribers.discard(subscriber)
+
+    return Response(
+        stream(), 
+        mimetype='text/event-stream', 
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
     )
 
 
@@ -165,7 +1502,8 @@ def applications():
     """
     Handle job applications listing and creation.
     
-    GET: Display all applications with their steps and related data
+    GET: Display all applications with their steps and related data;
+         archived applications are only included with ?include_archived=1
     POST: Create a new job application with initial step
     
     Returns:
@@ -175,64 +1513,44 @@ def applications():
         con = get_database_connection()
         cur = con.cursor()
 
-        # Get all applications with joined platform, step, and feedback information
+        # Get all applications; platform, step and feedback names and colors
+        # are resolved in the template from the cached reference data
         cur.execute("""
-            SELECT 
-                applications.*, 
-                platforms.name as platform_name, 
-                steps_definition.name as step_name, 
-                steps_definition.color as step_color, 
-                feedbacks_definition.name as feedback_name, 
-                feedbacks_definition.color as feedback_color 
+            SELECT * 
             FROM applications 
-            LEFT JOIN platforms ON applications.platform_id = platforms.id 
-            LEFT JOIN steps_definition ON applications.last_step = steps_definition.id 
-            LEFT JOIN feedbacks_definition ON applications.feedback_id = feedbacks_definition.id 
-            ORDER BY applications.application_date DESC
+            ORDER BY application_date DESC
         """)
         applications = cur.fetchall()
 
-        # Get reference data for form dropdowns
-        cur.execute("SELECT * FROM platforms")
-        platforms = cur.fetchall()
-
-        cur.execute("SELECT * FROM steps_definition")
-        steps_definition = cur.fetchall()
-
-        cur.execute("SELECT * FROM feedbacks_definition")
-        feedbacks_definition = cur.fetchall()
-
         # Enhance applications with their complete step history
         applications_with_steps = []
         for app in applications:
-            # Get all steps for this application with step details
-            cur.execute("""
-                SELECT 
-                    s.*, 
-                    sd.name as step_name, 
-                    sd.description as step_description, 
-                    sd.color as step_color
-                FROM steps s
-                JOIN steps_definition sd ON s.step_id = sd.id
-                WHERE s.application_id = ?
-                ORDER BY s.step_date ASC
-            """, (app['id'],))
-            
-            steps = cur.fetchall()
-
             # Convert Row object to dict and add steps
             app_dict = dict(app)
-            app_dict['steps'] = steps
+            app_dict['steps'] = load_application_steps(cur, app['id'])
             applications_with_steps.append(app_dict)
 
+        # Number of archived applications, shown on the archive toggle
+        archived_count = get_archive_summary(cur).get('applications', {}).get('', (0, 0))[0]
+
         con.close()
         
+        # Archived applications are read-only and loaded only on request
+        include_archived = request.args.get('include_archived') == '1'
+        if include_archived:
+            applications_with_steps += load_archived_applications()
+        
+        # Reference data for form dropdowns
+        reference = get_reference_data()
+        
         return render_template(
             'applications.html', 
             applications=applications_with_steps, 
-            platforms=platforms, 
-            steps_definition=steps_definition, 
-            feedbacks_definition=feedbacks_definition
+            include_archived=include_archived, 
+            archived_count=archived_count, 
+            platforms=reference['platforms'], 
+            steps_definition=reference['steps_definition'], 
+            feedbacks_definition=reference['feedbacks_definition']
         )
     
     if request.method == "POST":
@@ -272,12 +1590,58 @@ def applications():
             VALUES(?, ?, ?)
         """, (application_id, 1, application_date))
         
+        # Stored values (after type affinity) for the dashboard delta
+        cur.execute("""
+            SELECT 
+                platform_id, 
+                mode, 
+                application_date, 
+                application_date >= date('now', '-1 months') as in_trend
+            FROM applications 
+            WHERE id = ?
+        """, (application_id,))
+        created = cur.fetchone()
+        
         con.commit()
         con.close()
         
+        platform = get_reference_data()['platforms_by_id'].get(created['platform_id'], {})
+        application_data_changed('application_created', {
+            'application_id': application_id,
+            'platform_name': platform.get('name'),
+            'mode': created['mode'],
+            'application_date': created['application_date'],
+            'in_trend': bool(created['in_trend'])
+        })
+        
         return redirect(url_for('applications'))
 
 
+@app.route('/applications/archive', methods=['POST'])
+def archive_finalized_applications():
+    """
+    Move old finalized applications into the archive database.
+    
+    Returns:
+        Response: Redirect to applications page with the archived count
+    """
+    archived = archive_applications()
+    
+    flash(f"{archived} applications archived.")
+    return redirect(url_for('applications'))
+
+
+@app.cli.command('archive-applications')
+@click.option('--days', default=ARCHIVE_AFTER_DAYS, show_default=True, 
+              help='Minimum age in days of the final step.')
+@click.option('--batch-size', default=ARCHIVE_BATCH_SIZE, show_default=True, 
+              help='Applications moved per transaction.')
+def archive_applications_command(days, batch_size):
+    """Move old finalized applications into the archive database."""
+    archived = archive_applications(after_days=days, batch_size=batch_size)
+    click.echo(f"Archived {archived} applications into {ARCHIVE_DATABASE_PATH}")
+
+
 @app.route('/applications/<int:application_id>/delete', methods=['POST'])
 def delete_application(application_id):
     """
@@ -287,7 +1651,7 @@ def delete_application(application_id):
         application_id (int): ID of the application to delete
         
     Returns:
-        Response: Redirect to applications page
+        Response: JSON for AJAX requests, otherwise redirect to applications page
     """
     con = get_database_connection()
     cur = con.cursor()
@@ -298,6 +1662,12 @@ def delete_application(application_id):
     con.commit()
     con.close()
     
+    application_data_changed()
+    
+    # AJAX callers remove the card themselves
+    if wants_partial():
+        return {'deleted': application_id}
+    
     return redirect(url_for('applications'))
 
 
@@ -310,7 +1680,8 @@ def update_application(application_id):
         application_id (int): ID of the application to update
         
     Returns:
-        Response: Redirect to applications page
+        Response: Updated card fragment for AJAX requests, otherwise
+        redirect to applications page
     """
     # Extract updated form data
     application_date = request.form.get('application_date')
@@ -326,6 +1697,9 @@ def update_application(application_id):
     con = get_database_connection()
     cur = con.cursor()
 
+    # State before the write, used for the dashboard delta
+    before = get_application_delta(cur, application_id)
+
     # Update application with new data
     cur.execute("""
         UPDATE applications 
@@ -338,9 +1712,24 @@ def update_application(application_id):
         salary_range_max, expected_salary, mode, observation, application_id
     ))
     
+    # Stored values (after type affinity) for the dashboard delta
+    after = get_application_delta(cur, application_id)
+    
+    # Card of AJAX callers, read on the write connection
+    application = load_application(cur, application_id) if wants_partial() else None
+    
     con.commit()
     con.close()
     
+    if before and after:
+        application_data_changed('application_updated', build_update_event(application_id, before, after))
+    else:
+        application_data_changed()
+    
+    # AJAX callers get just the updated card
+    if wants_partial():
+        return render_application_partial(application)
+    
     return redirect(url_for('applications'))
 
 
@@ -353,7 +1742,8 @@ def add_step_application(application_id):
         application_id (int): ID of the application to add step to
         
     Returns:
-        Response: Redirect to applications page with success message
+        Response: Updated card fragment for AJAX requests, otherwise
+        redirect to applications page with success message
     """
     step_id = request.form.get('step_id')
     step_date = request.form.get('step_date')
@@ -362,6 +1752,9 @@ def add_step_application(application_id):
     con = get_database_connection()
     cur = con.cursor()
 
+    # State before the write, used for the dashboard delta
+    delta = get_step_delta(cur, application_id, step_id, step_date)
+
     # Insert new step record
     cur.execute("""
         INSERT INTO steps (application_id, step_id, observation, step_date) 
@@ -375,9 +1768,21 @@ def add_step_application(application_id):
         WHERE id = ?
     """, (step_id, step_date, application_id))
     
+    # Card of AJAX callers, read on the write connection
+    application = load_application(cur, application_id) if wants_partial() else None
+    
     con.commit()
     con.close()
     
+    if delta:
+        application_data_changed('step_reached', build_step_event(application_id, step_id, delta))
+    else:
+        application_data_changed()
+    
+    # AJAX callers get just the updated card
+    if wants_partial():
+        return render_application_partial(application)
+    
     flash("Step added successfully!")
     return redirect(url_for('applications'))
 
@@ -391,7 +1796,8 @@ def finalize_application(application_id):
         application_id (int): ID of the application to finalize
         
     Returns:
-        Response: Redirect to applications page with success message
+        Response: Updated card fragment for AJAX requests, otherwise
+        redirect to applications page with success message
     """
     final_step = request.form.get('final_step')
     feedback_id = request.form.get('feedback_id')
@@ -402,6 +1808,9 @@ def finalize_application(application_id):
     con = get_database_connection()
     cur = con.cursor()
 
+    # State before the write, used for the dashboard delta
+    delta = get_step_delta(cur, application_id, final_step, finalize_date)
+
     # Insert final step record
     cur.execute("""
         INSERT INTO steps (application_id, step_id, observation, step_date) 
@@ -425,13 +1834,189 @@ def finalize_application(application_id):
     
     cur.execute(update_query, params)
     
+    # Card of AJAX callers, read on the write connection
+    application = load_application(cur, application_id) if wants_partial() else None
+    
     con.commit()
     con.close()
     
+    if delta:
+        application_data_changed('application_finalized', build_step_event(application_id, final_step, delta))
+    else:
+        application_data_changed()
+    
+    # AJAX callers get just the updated card
+    if wants_partial():
+        return render_application_partial(application)
+    
     flash("Application finalized successfully!")
     return redirect(url_for('applications'))
 
 
+# Largest selection accepted by the bulk endpoint (SQLite caps the number
+# of bound parameters per statement)
+BULK_MAX_APPLICATIONS = 500
+
+
+@app.route('/applications/bulk', methods=['POST'])
+def bulk_update_applications():
+    """
+    Add the same step to, or finalize, many applications in one request.
+    
+    Form fields:
+        action: 'step' to add a step or 'finalize' to finalize
+        application_ids: Selected application IDs (repeated field)
+        step_id: Step to add (action 'step')
+        final_step, feedback_id, salary_offer: Result, feedback and optional
+            offer (action 'finalize')
+        step_date, observation: Date and note of the new step
+    
+    All steps rows are inserted and all applications updated with
+    executemany in a single transaction.
+    
+    Returns:
+        Response: For AJAX requests, JSON with per-item 'results' and the
+        re-rendered 'cards' of the updated applications (400 with 'error'
+        for an invalid request); otherwise redirect to applications page
+    """
+    action = request.form.get('action')
+    step_date = request.form.get('step_date')
+    observation = request.form.get('observation')
+    reference = get_reference_data()
+    
+    if action == 'finalize':
+        step_id = request.form.get('final_step')
+        feedback_id = request.form.get('feedback_id')
+        salary_offer = request.form.get('salary_offer')
+    else:
+        step_id = request.form.get('step_id')
+        feedback_id = None
+        salary_offer = None
+    
+    # Validate the shared fields once for the whole selection
+    error = None
+    if action not in ('step', 'finalize'):
+        error = "Unknown bulk action."
+    elif not step_id or not step_id.isdigit() or int(step_id) not in reference['steps_by_id']:
+        error = "Select a valid step."
+    elif action == 'finalize' and step_id not in ('6', '7'):
+        error = "Applications can only be finalized as Offer or Denied."
+    elif action == 'finalize' and (
+        not feedback_id or not feedback_id.isdigit() 
+        or int(feedback_id) not in reference['feedbacks_by_id']
+    ):
+        error = "Select a valid feedback."
+    elif not step_date:
+        error = "Select a date."
+    
+    # Per-item validation: malformed and duplicated ids are reported, not applied
+    results = {}
+    application_ids = []
+    for raw_id in request.form.getlist('application_ids'):
+        if not raw_id.isdigit():
+            results[raw_id] = {'application_id': raw_id, 'status': 'invalid', 'error': 'Invalid application id'}
+        elif int(raw_id) not in results:
+            application_ids.append(int(raw_id))
+            results[int(raw_id)] = None
+    
+    if error is None and not application_ids:
+        error = "Select at least one application."
+    elif error is None and len(application_ids) > BULK_MAX_APPLICATIONS:
+        error = f"Select at most {BULK_MAX_APPLICATIONS} applications."
+    
+    if error:
+        if wants_partial():
+            return {'error': error}, 400
+        flash(error)
+        return redirect(url_for('applications'))
+    
+    con = get_database_connection()
+    cur = con.cursor()
+    
+    # State before the writes, used for the dashboard deltas; it also tells
+    # which of the selected applications exist
+    deltas = get_step_deltas(cur, application_ids, step_id, step_date)
+    updated_ids = [application_id for application_id in application_ids if application_id in deltas]
+    
+    # Insert one step record per application
+    cur.executemany("""
+        INSERT INTO steps (application_id, step_id, observation, step_date) 
+        VALUES (?, ?, ?, ?)
+    """, [(application_id, step_id, observation, step_date) for application_id in updated_ids])
+    
+    # Update the applications' last step (and feedback when finalizing)
+    if action == 'finalize':
+        update_query = """
+            UPDATE applications 
+            SET last_step = ?, last_step_date = ?, feedback_id = ?, feedback_date = ?
+        """
+        params = [step_id, step_date, feedback_id, step_date]
+        
+        # Add salary offer if provided
+        if salary_offer:
+            update_query += ", salary_offer = ?"
+            params.append(salary_offer)
+        
+        update_query += " WHERE id = ?"
+    else:
+        update_query = """
+            UPDATE applications 
+            SET last_step = ?, last_step_date = ? 
+            WHERE id = ?
+        """
+        params = [step_id, step_date]
+    
+    cur.executemany(update_query, [(*params, application_id) for application_id in updated_ids])
+    
+    # Re-rendered cards for the page, loaded in two queries on the write
+    # connection and rendered before committing
+    cards = {
+        application_id: render_template('application_card.html', application=application)
+        for application_id, application in (
+            load_applications(cur, updated_ids) if wants_partial() else {}
+        ).items()
+    }
+    
+    con.commit()
+    con.close()
+    
+    # One version bump and one event for the whole selection, so a large
+    # selection cannot overflow the dashboards' event queues
+    if updated_ids:
+        application_data_changed('steps_reached', {
+            'finalized': action == 'finalize',
+            'steps': [
+                build_step_event(application_id, step_id, deltas[application_id])
+                for application_id in updated_ids
+            ]
+        })
+    
+    for application_id in application_ids:
+        if application_id in deltas:
+            results[application_id] = {'application_id': application_id, 'status': 'updated'}
+        else:
+            results[application_id] = {
+                'application_id': application_id, 'status': 'not_found', 'error': 'Application not found'
+            }
+    
+    if wants_partial():
+        return {
+            'updated': len(updated_ids),
+            'results': list(results.values()),
+            'cards': cards
+        }
+    
+    flash(f"{len(updated_ids)} applications updated.")
+    
+    # Report what was skipped, like the per-item results of AJAX requests
+    failures = [result for result in results.values() if result['status'] != 'updated']
+    if failures:
+        flash("Not updated: " + ", ".join(
+            f"application {result['application_id']} ({result['error'].lower()})" for result in failures
+        ))
+    return redirect(url_for('applications'))
+
+
 @app.route('/applications/<int:application_id>/steps/<int:step_id>/delete', methods=['POST'])
 def delete_step_application(application_id, step_id):
     """
@@ -442,20 +2027,38 @@ def delete_step_application(application_id, step_id):
         step_id (int): ID of the step record to delete
         
     Returns:
-        Response: Redirect to applications page
+        Response: Updated card fragment for AJAX requests, otherwise
+        redirect to applications page
     """
     con = get_database_connection()
     cur = con.cursor()
 
+    # State before the write, used for the dashboard delta
+    removed = get_step_record_delta(cur, application_id, step_id)
+
     # Delete the specific step record
     cur.execute("""
         DELETE FROM steps 
         WHERE application_id = ? AND id = ?
     """, (application_id, step_id))
     
+    # Card of AJAX callers, read on the write connection
+    application = load_application(cur, application_id) if wants_partial() else None
+    
     con.commit()
     con.close()
     
+    if removed and isinstance(removed['step_id'], int):
+        application_data_changed('step_removed', dict(
+            build_step_record_event(removed), application_id=application_id
+        ))
+    else:
+        application_data_changed()
+    
+    # AJAX callers get just the updated card
+    if wants_partial():
+        return render_application_partial(application)
+    
     return redirect(url_for('applications'))
 
 
@@ -469,7 +2072,8 @@ def update_step_application(application_id, step_id):
         step_id (int): ID of the step record to update
         
     Returns:
-        Response: Redirect to applications page
+        Response: Updated card fragment for AJAX requests, otherwise
+        redirect to applications page
     """
     steps_id = request.form.get('step_id')
     step_date = request.form.get('step_date')
@@ -478,6 +2082,9 @@ def update_step_application(application_id, step_id):
     con = get_database_connection()
     cur = con.cursor()
 
+    # State before the write, used for the dashboard delta
+    removed = get_step_record_delta(cur, application_id, step_id)
+
     # Update the step record
     cur.execute("""
         UPDATE steps 
@@ -485,9 +2092,28 @@ def update_step_application(application_id, step_id):
         WHERE application_id = ? AND id = ?
     """, (steps_id, step_date, observation, application_id, step_id))
     
+    added = get_step_record_delta(cur, application_id, step_id)
+    
+    # Card of AJAX callers, read on the write connection
+    application = load_application(cur, application_id) if wants_partial() else None
+    
     con.commit()
     con.close()
     
+    # The edit counts as removing the old record and adding the new one
+    if removed and added and isinstance(removed['step_id'], int) and isinstance(added['step_id'], int):
+        application_data_changed('step_updated', {
+            'application_id': application_id,
+            'removed': build_step_record_event(removed),
+            'added': build_step_record_event(added)
+        })
+    else:
+        application_data_changed()
+    
+    # AJAX callers get just the updated card
+    if wants_partial():
+        return render_application_partial(application)
+    
     return redirect(url_for('applications'))
 
 
@@ -503,16 +2129,13 @@ def platforms():
         str: Rendered platforms.html template or redirect to platforms page
     """
     if request.method == "GET":
-        con = get_database_connection()
-        cur = con.cursor()
-
-        # Get all platforms
-        cur.execute("SELECT * FROM platforms")
-        platforms = cur.fetchall()
+        # Get all platforms from the reference data cache
+        platforms = get_reference_data()['platforms']
         
-        con.close()
+        # Application counts per platform from the usage counters
+        usage_counts = get_usage_counts()['platforms']
         
-        return render_template('platforms.html', platforms=platforms)
+        return render_template('platforms.html', platforms=platforms, usage_counts=usage_counts)
     
     if request.method == "POST":
         # Extract form data for new platform
@@ -528,9 +2151,24 @@ def platforms():
         con.commit()
         con.close()
         
+        invalidate_reference_data()
+        
         return redirect(url_for('platforms'))
 
 
+@app.route('/usage_counts', methods=['GET'])
+def usage_counts():
+    """
+    Get the application counts for every platform, step and feedback
+    definition in a single response.
+    
+    Returns:
+        dict: JSON response with 'platforms', 'steps' and 'feedbacks'
+        objects mapping definition ids to application counts
+    """
+    return get_usage_counts()
+
+
 @app.route('/platforms/<int:platform_id>/check_applications', methods=['GET'])
 def check_platform_applications(platform_id):
     """
@@ -542,14 +2180,8 @@ def check_platform_applications(platform_id):
     Returns:
         dict: JSON response with application count
     """
-    con = get_database_connection()
-    cur = con.cursor()
-    
-    # Count applications using this platform
-    cur.execute("SELECT COUNT(*) FROM applications WHERE platform_id = ?", [platform_id])
-    count = cur.fetchone()[0]
-    
-    con.close()
+    # Read the maintained usage counter instead of counting applications
+    count = get_usage_count('platform', platform_id)
     
     return {'count': count}
 
@@ -581,13 +2213,16 @@ def update_platform(platform_id):
     con.commit()
     con.close()
     
+    invalidate_reference_data()
+    
     return redirect(url_for('platforms'))
 
 
 @app.route('/platforms/<int:platform_id>/delete', methods=['POST'])
 def delete_platform(platform_id):
     """
-    Delete a platform and all associated applications.
+    Delete a platform and all associated applications, archived ones
+    included.
     
     Args:
         platform_id (int): ID of the platform to delete
@@ -596,6 +2231,10 @@ def delete_platform(platform_id):
         Response: Redirect to platforms page
     """
     con = get_database_connection()
+    
+    # Archived applications are deleted in the same transaction
+    delete_archived_applications(con, 'platform', platform_id)
+    
     cur = con.cursor()
 
     # Delete all applications using this platform first
@@ -607,6 +2246,9 @@ def delete_platform(platform_id):
     con.commit()
     con.close()
     
+    invalidate_reference_data()
+    application_data_changed()
+    
     return redirect(url_for('platforms'))
 
 
@@ -622,20 +2264,21 @@ def settings():
         str: Rendered settings.html template or redirect to settings page
     """
     if request.method == "GET":
-        con = get_database_connection()
-        cur = con.cursor()
-
-        # Get all feedback definitions
-        cur.execute("SELECT * FROM feedbacks_definition")
-        feedbacks = cur.fetchall()
-
-        # Get all step definitions
-        cur.execute("SELECT * FROM steps_definition")
-        steps = cur.fetchall()
-
-        con.close()
+        # Get all feedback and step definitions from the reference data cache
+        reference = get_reference_data()
+        feedbacks = reference['feedbacks_definition']
+        steps = reference['steps_definition']
+        
+        # Application counts per definition from the usage counters
+        usage_counts = get_usage_counts()
         
-        return render_template('settings.html', feedbacks=feedbacks, steps=steps)
+        return render_template(
+            'settings.html', 
+            feedbacks=feedbacks, 
+            steps=steps, 
+            step_usage_counts=usage_counts['steps'], 
+            feedback_usage_counts=usage_counts['feedbacks']
+        )
     
     if request.method == "POST":
         form_type = request.form.get('form_type')
@@ -657,6 +2300,8 @@ def settings():
             con.commit()
             con.close()
             
+            invalidate_reference_data()
+            
             return redirect(url_for('settings'))
 
         elif form_type == 'create_feedback_defition':
@@ -676,6 +2321,8 @@ def settings():
             con.commit()
             con.close()
             
+            invalidate_reference_data()
+            
             return redirect(url_for('settings'))
 
 
@@ -690,18 +2337,8 @@ def check_steps_applications(step_id):
     Returns:
         dict: JSON response with application count
     """
-    con = get_database_connection()
-    cur = con.cursor()
-    
-    # Count distinct applications that have used this step
-    cur.execute("""
-        SELECT COUNT(DISTINCT application_id) 
-        FROM steps 
-        WHERE step_id = ?
-    """, [step_id])
-    count = cur.fetchone()[0]
-    
-    con.close()
+    # Read the maintained counter of distinct applications that used this step
+    count = get_usage_count('step', step_id)
     
     return {'count': count}
 
@@ -734,13 +2371,16 @@ def update_step_definition(step_id):
     con.commit()
     con.close()
     
+    invalidate_reference_data()
+    
     return redirect(url_for('settings'))
 
 
 @app.route('/settings/steps/<int:step_id>/delete', methods=['POST'])
 def delete_step_definition(step_id):
     """
-    Delete a step definition and all applications that use it.
+    Delete a step definition and all applications that use it, archived
+    ones included.
     
     WARNING: This is a destructive operation that deletes applications!
     
@@ -751,6 +2391,10 @@ def delete_step_definition(step_id):
         Response: Redirect to settings page
     """
     con = get_database_connection()
+    
+    # Archived applications are deleted in the same transaction
+    delete_archived_applications(con, 'step', step_id)
+    
     cur = con.cursor()
 
     # Delete all applications that have used this step
@@ -770,6 +2414,9 @@ def delete_step_definition(step_id):
     con.commit()
     con.close()
     
+    invalidate_reference_data()
+    application_data_changed()
+    
     return redirect(url_for('settings'))
 
 
@@ -784,14 +2431,8 @@ def check_feedbacks_applications(feedback_id):
     Returns:
         dict: JSON response with application count
     """
-    con = get_database_connection()
-    cur = con.cursor()
-    
-    # Count applications using this feedback
-    cur.execute("SELECT COUNT(*) FROM applications WHERE feedback_id = ?", [feedback_id])
-    count = cur.fetchone()[0]
-    
-    con.close()
+    # Read the maintained usage counter instead of counting applications
+    count = get_usage_count('feedback', feedback_id)
     
     return {'count': count}
 
@@ -824,13 +2465,16 @@ def update_feedback_definition(feedback_id):
     con.commit()
     con.close()
     
+    invalidate_reference_data()
+    
     return redirect(url_for('settings'))
 
 
 @app.route('/settings/feedbacks/<int:feedback_id>/delete', methods=['POST'])
 def delete_feedback_definition(feedback_id):
     """
-    Delete a feedback definition and all applications that use it.
+    Delete a feedback definition and all applications that use it,
+    archived ones included.
     
     WARNING: This is a destructive operation that deletes applications!
     
@@ -841,6 +2485,10 @@ def delete_feedback_definition(feedback_id):
         Response: Redirect to settings page
     """
     con = get_database_connection()
+    
+    # Archived applications are deleted in the same transaction
+    delete_archived_applications(con, 'feedback', feedback_id)
+    
     cur = con.cursor()
 
     # Delete all applications using this feedback
@@ -853,9 +2501,50 @@ def delete_feedback_definition(feedback_id):
     con.commit()
     con.close()
     
+    invalidate_reference_data()
+    application_data_changed()
+    
     return redirect(url_for('settings'))
 
 
+@app.route('/admin/profiles', methods=['GET'])
+def profiles():
+    """
+    List the saved request profiles, newest first.
+    
+    Returns:
+        str: Rendered profiles.html template
+    """
+    reports = request_profiler.list_reports()
+    
+    return render_template('profiles.html', reports=reports, report=None)
+
+
+@app.route('/admin/profiles/<report_id>', methods=['GET'])
+def profile_report(report_id):
+    """
+    Show a saved request profile with its SQL statements, slow query
+    plans and cProfile summary.
+    
+    Args:
+        report_id (str): ID of the report
+        
+    Returns:
+        str: Rendered profiles.html template, 404 if the report is gone
+    """
+    report = request_profiler.load_report(report_id)
+    if report is None:
+        abort(404)
+    
+    reports = request_profiler.list_reports()
+    
+    return render_template('profiles.html', reports=reports, report=report)
+
+
+# Create derived tables and triggers and rebuild the usage counters
+init_database()
+
+
 # Application entry point
 if __name__ == '__main__':
     app.run(debug=False, host='0.0.0.0', port=8088)
\ No newline at end of file
@@ -0,0 +1,467 @@
+"""
+Concurrent mixed-workload load test for the Job Application Tracker.
+
+Starts the Flask app in a separate process against a scratch copy of the
+SQLite database, then runs a configurable number of reader and writer
+threads against it for a fixed duration. Readers hit the dashboard and
+listing pages; writers create applications, add steps, finalize and edit
+them. The report includes:
+
+- Throughput and latency percentiles per operation
+- HTTP errors and 'database is locked' errors raised inside the server
+- Write-lock wait time, measured by a probe that repeatedly acquires the
+  SQLite write lock (BEGIN IMMEDIATE) while the load is running
+
+Usage:
+    python load_test.py --readers 8 --writers 2 --duration 30
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+import numpy as np
+
+# Server bootstrap executed in the child process. DATABASE_PATH is passed
+# through the environment so the app only ever touches the scratch copy.
+SERVER_SCRIPT = """
+import logging
+import sys
+
+from werkzeug.serving import make_server
+
+import app
+
+logging.getLogger('werkzeug').setLevel(logging.ERROR)
+server = make_server(sys.argv[1], int(sys.argv[2]), app.app, threaded=True)
+print('READY', server.port, flush=True)
+server.serve_forever()
+"""
+
+# Marker logged by Flask when a request fails on SQLite lock contention
+LOCKED_ERROR_MARKER = 'OperationalError: database is locked'
+
+# Read operations and their relative weights
+READ_MIX = {
+    'GET /home': ('/home', 3),
+    'GET /applications': ('/applications', 3),
+    'GET /usage_counts': ('/usage_counts', 1)
+}
+
+# Write operations and their relative weights
+WRITE_MIX = {
+    'POST /applications': 2,
+    'POST add-step': 3,
+    'POST finalize': 1,
+    'POST update': 2
+}
+
+# Percentiles reported for latencies and lock waits
+REPORT_PERCENTILES = (50, 95, 99)
+
+
+def parse_arguments():
+    """
+    Parse command line options.
+
+    Returns:
+        argparse.Namespace: Load test configuration
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--readers', type=int, default=8,
+                        help='number of concurrent reader threads')
+    parser.add_argument('--writers', type=int, default=2,
+                        help='number of concurrent writer threads')
+    parser.add_argument('--duration', type=float, default=30,
+                        help='seconds to run the workload')
+    parser.add_argument('--think-time', type=float, default=0,
+                        help='seconds each client waits between requests')
+    parser.add_argument('--seed-applications', type=int, default=200,
+                        help='applications inserted before the run starts')
+    parser.add_argument('--database', default='database.db',
+                        help='database copied into the scratch directory')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0,
+                        help='server port (0 picks a free port)')
+    parser.add_argument('--probe-interval', type=float, default=0.05,
+                        help='seconds between write-lock probes')
+    parser.add_argument('--json', dest='json_path',
+                        help='also write the report as JSON to this path')
+    parser.add_argument('--keep-database', action='store_true',
+                        help='keep the scratch database after the run')
+    return parser.parse_args()
+
+
+def seed_database(database_path, count):
+    """
+    Insert applications (with their initial step) before the run starts.
+
+    Args:
+        database_path (str): Scratch database path
+        count (int): Number of applications to insert
+
+    Returns:
+        dict: 'application_ids', 'platform_ids', 'step_ids' and
+        'feedback_ids' available to the writers
+    """
+    con = sqlite3.connect(database_path)
+    con.execute("PRAGMA foreign_keys = ON")
+
+    platform_ids = [row[0] for row in con.execute("SELECT id FROM platforms")]
+    step_ids = [row[0] for row in con.execute("SELECT id FROM steps_definition")]
+    feedback_ids = [row[0] for row in con.execute("SELECT id FROM feedbacks_definition")]
+
+    today = date.today()
+    for index in range(count):
+        application_date = (today - timedelta(days=random.randint(0, 365))).isoformat()
+        cur = con.execute("""
+            INSERT INTO applications
+            (company, role, application_date, platform_id, expected_salary, mode,
+             salary_range_min, salary_range_max, observation, last_step,
+             last_step_date, feedback_id, feedback_date)
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, 1, ?)
+        """, (
+            f'Seed Company {index}', random.choice(['Backend', 'Frontend', 'Data']),
+            application_date, random.choice(platform_ids), random.randint(80, 160),
+            random.choice(['active', 'passive']), random.randint(70, 110),
+            random.randint(110, 170), 'load test seed', application_date,
+            application_date
+        ))
+        con.execute(
+            "INSERT INTO steps (application_id, step_id, step_date) VALUES(?, 1, ?)",
+            (cur.lastrowid, application_date)
+        )
+
+    con.commit()
+    application_ids = [row[0] for row in con.execute("SELECT id FROM applications")]
+    con.close()
+
+    return {
+        'application_ids': application_ids,
+        'platform_ids': platform_ids,
+        'step_ids': [step_id for step_id in step_ids if step_id not in (1, 6, 7)] or step_ids,
+        'feedback_ids': feedback_ids
+    }
+
+
+def start_server(database_path, host, port):
+    """
+    Start the app in a child process using the scratch database.
+
+    Args:
+        database_path (str): Scratch database path
+        host (str): Interface to bind
+        port (int): Port to bind (0 for a free port)
+
+    Returns:
+        tuple: (process, port, locked_errors, watcher) where locked_errors
+        is a dict whose 'count' is updated by the watcher thread while the
+        server logs lock errors
+    """
+    env = dict(os.environ, DATABASE_PATH=database_path)
+    process = subprocess.Popen(
+        [sys.executable, '-c', SERVER_SCRIPT, host, str(port)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+
+    ready_line = process.stdout.readline()
+    if not ready_line.startswith('READY'):
+        process.kill()
+        raise RuntimeError('Server failed to start:\n' + process.stderr.read())
+
+    locked_errors = {'count': 0}
+
+    def watch_stderr():
+        # Count lock errors in the tracebacks Flask logs for failed requests
+        for line in process.stderr:
+            if LOCKED_ERROR_MARKER in line:
+                locked_errors['count'] += 1
+
+    watcher = threading.Thread(target=watch_stderr, daemon=True)
+    watcher.start()
+    return process, int(ready_line.split()[1]), locked_errors, watcher
+
+
+class Recorder:
+    """
+    Thread-safe collection of latencies and errors per operation.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, operation, latency, failed):
+        """Record one request's latency in seconds and whether it failed."""
+        with self.lock:
+            self.latencies.setdefault(operation, []).append(latency)
+            if failed:
+                self.errors[operation] = self.errors.get(operation, 0) + 1
+
+
+def send_request(host, port, method, path, form=None):
+    """
+    Send one request without following redirects.
+
+    Returns:
+        int: HTTP status code, or 0 when the connection failed
+    """
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    try:
+        body = urlencode(form) if form else None
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'} if form else {}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except OSError:
+        return 0
+    finally:
+        connection.close()
+
+
+def build_write(operation, ids):
+    """
+    Build the path and form for a write operation.
+
+    Args:
+        operation (str): Key of WRITE_MIX
+        ids (dict): Identifiers returned by seed_database
+
+    Returns:
+        tuple: (path, form)
+    """
+    today = date.today().isoformat()
+    application_id = random.choice(ids['application_ids'])
+
+    if operation == 'POST /applications':
+        return '/applications', {
+            'company': 'Load Test Company', 'role': 'Engineer',
+            'application_date': today, 'platform_id': random.choice(ids['platform_ids']),
+            'expected_salary': random.randint(80, 160), 'mode': 'active',
+            'salary_range_min': 90, 'salary_range_max': 140, 'observation': ''
+        }
+    if operation == 'POST add-step':
+        return f'/applications/{application_id}/add-step', {
+            'step_id': random.choice(ids['step_ids']), 'step_date': today,
+            'observation': 'load test'
+        }
+    if operation == 'POST finalize':
+        return f'/applications/{application_id}/finalize', {
+            'final_step': random.choice([6, 7]), 'feedback_id': random.choice(ids['feedback_ids']),
+            'finalize_date': today, 'salary_offer': random.randint(90, 170),
+            'final_observation': 'load test'
+        }
+    return f'/applications/{application_id}/update', {
+        'application_date': today, 'company': 'Load Test Company (edited)',
+        'role': 'Engineer', 'platform_id': random.choice(ids['platform_ids']),
+        'salary_range_min': 90, 'salary_range_max': 140, 'expected_salary': 120,
+        'mode': 'passive', 'observation': 'edited'
+    }
+
+
+def run_client(kind, host, port, ids, recorder, stop_at, think_time):
+    """
+    Issue weighted random reads or writes until stop_at.
+
+    Args:
+        kind (str): 'reader' or 'writer'
+    """
+    if kind == 'reader':
+        operations = list(READ_MIX)
+        weights = [READ_MIX[operation][1] for operation in operations]
+    else:
+        operations = list(WRITE_MIX)
+        weights = [WRITE_MIX[operation] for operation in operations]
+
+    while time.monotonic() < stop_at:
+        operation = random.choices(operations, weights)[0]
+        if kind == 'reader':
+            method, path, form = 'GET', READ_MIX[operation][0], None
+        else:
+            method = 'POST'
+            path, form = build_write(operation, ids)
+
+        started = time.perf_counter()
+        status = send_request(host, port, method, path, form)
+        latency = time.perf_counter() - started
+
+        # Writes answer with a redirect, reads with 200
+        recorder.record(operation, latency, failed=status == 0 or status >= 400)
+
+        if think_time:
+            time.sleep(think_time)
+
+
+def run_lock_probe(database_path, interval, stop_at, waits):
+    """
+    Repeatedly acquire and release the SQLite write lock, recording how
+    long each acquisition had to wait behind the app's transactions.
+    """
+    con = sqlite3.connect(database_path, timeout=60, isolation_level=None)
+    while time.monotonic() < stop_at:
+        started = time.perf_counter()
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            waits.append(time.perf_counter() - started)
+            con.execute("ROLLBACK")
+        except sqlite3.OperationalError:
+            waits.append(time.perf_counter() - started)
+        time.sleep(interval)
+    con.close()
+
+
+def summarize(values):
+    """
+    Summarize durations in milliseconds.
+
+    Returns:
+        dict: count, mean, percentiles and max (None when empty)
+    """
+    if not values:
+        return {'count': 0, 'mean_ms': None, 'max_ms': None,
+                **{f'p{p}_ms': None for p in REPORT_PERCENTILES}}
+
+    milliseconds = np.asarray(values) * 1000
+    percentiles = np.percentile(milliseconds, REPORT_PERCENTILES)
+    return {
+        'count': len(values),
+        'mean_ms': round(float(milliseconds.mean()), 2),
+        **{f'p{p}_ms': round(float(value), 2) for p, value in zip(REPORT_PERCENTILES, percentiles)},
+        'max_ms': round(float(milliseconds.max()), 2)
+    }
+
+
+def build_report(args, recorder, elapsed, locked_errors, lock_waits):
+    """
+    Build the final report from the recorded measurements.
+
+    Returns:
+        dict: Configuration, per-operation statistics and totals
+    """
+    operations = {}
+    for operation, latencies in sorted(recorder.latencies.items()):
+        errors = recorder.errors.get(operation, 0)
+        operations[operation] = {
+            'throughput_rps': round(len(latencies) / elapsed, 2),
+            'errors': errors,
+            **summarize(latencies)
+        }
+
+    total_requests = sum(len(latencies) for latencies in recorder.latencies.values())
+    total_errors = sum(recorder.errors.values())
+    lock_summary = summarize(lock_waits)
+    lock_summary['total_wait_s'] = round(sum(lock_waits), 3)
+
+    return {
+        'config': {
+            'readers': args.readers, 'writers': args.writers,
+            'duration_s': args.duration, 'think_time_s': args.think_time,
+            'seed_applications': args.seed_applications
+        },
+        'elapsed_s': round(elapsed, 2),
+        'total_requests': total_requests,
+        'throughput_rps': round(total_requests / elapsed, 2),
+        'errors': total_errors,
+        'error_rate': round(total_errors / total_requests * 100, 2) if total_requests else 0,
+        'database_locked_errors': locked_errors,
+        'database_locked_rate': round(locked_errors / total_requests * 100, 2) if total_requests else 0,
+        'operations': operations,
+        'lock_wait': lock_summary
+    }
+
+
+def print_report(report):
+    """Print the report as a human readable table."""
+    config = report['config']
+    print(f"\nReaders: {config['readers']}  Writers: {config['writers']}  "
+          f"Duration: {report['elapsed_s']}s  Seeded: {config['seed_applications']}")
+    print(f"Requests: {report['total_requests']}  Throughput: {report['throughput_rps']} req/s  "
+          f"Errors: {report['errors']} ({report['error_rate']}%)")
+    print(f"'database is locked' errors: {report['database_locked_errors']} "
+          f"({report['database_locked_rate']}% of requests)\n")
+
+    header = f"{'Operation':<22}{'Count':>8}{'Req/s':>9}{'Err':>6}"
+    header += ''.join(f"{'p' + str(p) + ' ms':>10}" for p in REPORT_PERCENTILES) + f"{'max ms':>10}"
+    print(header)
+    print('-' * len(header))
+    for operation, stats in report['operations'].items():
+        line = f"{operation:<22}{stats['count']:>8}{stats['throughput_rps']:>9}{stats['errors']:>6}"
+        line += ''.join(f"{stats[f'p{p}_ms']:>10}" for p in REPORT_PERCENTILES)
+        line += f"{stats['max_ms']:>10}"
+        print(line)
+
+    lock = report['lock_wait']
+    print(f"\nWrite-lock wait ({lock['count']} probes): mean {lock['mean_ms']} ms, "
+          f"p95 {lock['p95_ms']} ms, max {lock['max_ms']} ms, total {lock['total_wait_s']} s")
+
+
+def main():
+    args = parse_arguments()
+
+    scratch_dir = tempfile.mkdtemp(prefix='job-tracker-load-')
+    database_path = os.path.join(scratch_dir, 'database.db')
+    shutil.copyfile(args.database, database_path)
+
+    ids = seed_database(database_path, args.seed_applications)
+    process, port, locked_errors, watcher = start_server(database_path, args.host, args.port)
+
+    try:
+        recorder = Recorder()
+        lock_waits = []
+        started = time.monotonic()
+        stop_at = started + args.duration
+
+        threads = [
+            threading.Thread(target=run_client, args=(
+                'reader', args.host, port, ids, recorder, stop_at, args.think_time))
+            for _ in range(args.readers)
+        ] + [
+            threading.Thread(target=run_client, args=(
+                'writer', args.host, port, ids, recorder, stop_at, args.think_time))
+            for _ in range(args.writers)
+        ] + [
+            threading.Thread(target=run_lock_probe, args=(
+                database_path, args.probe_interval, stop_at, lock_waits))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+    finally:
+        process.terminate()
+        process.wait()
+        # Let the watcher drain the remaining server output
+        watcher.join(timeout=5)
+
+    report = build_report(args, recorder, elapsed, locked_errors['count'], lock_waits)
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+    if args.keep_database:
+        print(f'\nScratch database kept at {database_path}')
+    else:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+"""
+Opt-in request profiler and slow-query log.
+
+A request is profiled when it carries the X-Profile header or is picked by
+the PROFILE_SAMPLE_RATE sampling rate. Profiled requests run under cProfile
+and use a timing database connection that records every SQL statement with
+its duration. Statements slower than PROFILE_SLOW_QUERY_MS are logged
+together with their EXPLAIN QUERY PLAN output. Each profiled request is
+saved as a JSON report in PROFILE_DIR, keeping only the newest PROFILE_KEEP
+reports.
+"""
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import sqlite3
+import textwrap
+import threading
+import time
+import uuid
+
+# Header that turns profiling on for a single request
+PROFILE_HEADER = 'X-Profile'
+
+# Fraction of requests profiled without the header (0 disables sampling)
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+
+# Statements slower than this are logged with their query plan
+SLOW_QUERY_MS = float(os.environ.get('PROFILE_SLOW_QUERY_MS', '100'))
+
+# Directory where reports are written and how many of them are kept
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '50'))
+
+# Number of functions kept in the cProfile summary of a report
+TOP_FUNCTIONS = 30
+
+# Report ids are generated by new_report_id; anything else is rejected
+REPORT_ID_PATTERN = re.compile(r'^[0-9]{8}-[0-9]{6}-[0-9]{3}-[0-9a-f]{6}$')
+
+logger = logging.getLogger(__name__)
+
+# cProfile cannot reliably profile overlapping requests, so only one
+# request is profiled at a time and concurrent ones run unprofiled
+profiler_lock = threading.Lock()
+
+
+def should_profile(headers):
+    """
+    Decide whether the current request is profiled.
+
+    Args:
+        headers (werkzeug.datastructures.Headers): Request headers
+
+    Returns:
+        bool: True when the profile header is set or the request is sampled
+    """
+    if headers.get(PROFILE_HEADER, '').lower() in ('1', 'true', 'yes'):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """Cursor that times its statements and the fetches that follow them."""
+
+    query = None
+    statement = None
+    parameters = ()
+
+    def execute(self, sql, parameters=()):
+        self.start_query(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.add_time(started)
+
+    def executemany(self, sql, seq_of_parameters):
+        seq_of_parameters = list(seq_of_parameters)
+        self.start_query(
+            sql, seq_of_parameters[0] if seq_of_parameters else (),
+            batch_size=len(seq_of_parameters)
+        )
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self.add_time(started)
+
+    def executescript(self, sql_script):
+        self.start_query(sql_script, script=True)
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self.add_time(started)
+
+    def fetchone(self):
+        return self.timed_fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        return self.timed_fetch(super().fetchmany, size)
+
+    def fetchall(self):
+        return self.timed_fetch(super().fetchall)
+
+    def timed_fetch(self, fetch, *args):
+        """SQLite runs SELECTs lazily, so fetch time counts toward the query."""
+        started = time.perf_counter()
+        try:
+            rows = fetch(*args)
+        finally:
+            self.add_time(started)
+
+        if self.query is not None and rows is not None:
+            self.query['rows'] += len(rows) if isinstance(rows, list) else 1
+        return rows
+
+    def start_query(self, sql, parameters=(), batch_size=None, script=False):
+        """Record a new statement; the statement is kept for EXPLAIN."""
+        self.query = self.connection.request_profile.start_query(
+            sql, parameters, batch_size=batch_size, script=script
+        )
+        self.statement = sql
+        self.parameters = parameters
+
+    def add_time(self, started):
+        """Add the time elapsed since started to the current statement."""
+        if self.query is not None:
+            self.connection.request_profile.add_time(
+                self.query, started, self.connection, self.statement, self.parameters
+            )
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """Connection whose cursors record into the request profile."""
+
+    request_profile = None
+
+    def cursor(self, factory=ProfilingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+class RequestProfile:
+    """cProfile run and SQL statements recorded for one request."""
+
+    def __init__(self, method, path):
+        self.started_at = time.time()
+        self.id = new_report_id(self.started_at)
+        self.method = method
+        self.path = path
+        self.queries = []
+        self.started = time.perf_counter()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def connect(self, database_path):
+        """
+        Open a timing connection bound to this profile.
+
+        Args:
+            database_path (str): SQLite database file
+
+        Returns:
+            ProfilingConnection: Connection recording into this profile
+        """
+        con = sqlite3.connect(database_path, factory=ProfilingConnection)
+        con.request_profile = self
+        return con
+
+    def start_query(self, sql, parameters=(), batch_size=None, script=False):
+        """Register a statement and return its record."""
+        if isinstance(parameters, dict):
+            params = ['%s=%r' % (name, value) for name, value in parameters.items()]
+        else:
+            params = [repr(value) for value in parameters]
+
+        query = {
+            'sql': textwrap.dedent(sql).strip(),
+            'params': params if not script else [],
+            'batch_size': batch_size,
+            'duration_ms': 0.0,
+            'rows': 0,
+            'slow': False,
+            'plan': None,
+            'script': script
+        }
+        self.queries.append(query)
+        return query
+
+    def add_time(self, query, started, con, sql, parameters=()):
+        """
+        Add elapsed time to a statement and capture its query plan the
+        first time it crosses the slow-query threshold.
+        """
+        query['duration_ms'] += (time.perf_counter() - started) * 1000
+        if query['slow'] or query['duration_ms'] < SLOW_QUERY_MS:
+            return
+
+        query['slow'] = True
+        if not query['script']:
+            query['plan'] = explain_query_plan(con, sql, parameters)
+
+        logger.warning(
+            "Slow query (%.1f ms) on %s %s: %s\n%s",
+            query['duration_ms'], self.method, self.path, query['sql'],
+            '\n'.join(query['plan'] or ['(no query plan)'])
+        )
+
+    def finish(self, status_code):
+        """
+        Stop profiling and build the report.
+
+        Args:
+            status_code (int): HTTP status of the response
+
+        Returns:
+            dict: JSON serializable report
+        """
+        self.profiler.disable()
+        duration_ms = (time.perf_counter() - self.started) * 1000
+
+        for query in self.queries:
+            query['duration_ms'] = round(query['duration_ms'], 3)
+
+        return {
+            'id': self.id,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started_at)),
+            'method': self.method,
+            'path': self.path,
+            'status': status_code,
+            'duration_ms': round(duration_ms, 3),
+            'query_count': len(self.queries),
+            'sql_ms': round(sum(query['duration_ms'] for query in self.queries), 3),
+            'slow_query_count': sum(1 for query in self.queries if query['slow']),
+            'slow_query_ms': SLOW_QUERY_MS,
+            'queries': self.queries,
+            'functions': summarize_profile(self.profiler)
+        }
+
+
+def explain_query_plan(con, sql, parameters=()):
+    """
+    Get the EXPLAIN QUERY PLAN output of a statement.
+
+    Runs on a plain cursor so the plan query itself is not recorded.
+
+    Args:
+        con (sqlite3.Connection): Connection the statement ran on
+        sql (str): Statement
+        parameters (tuple | dict): Statement parameters
+
+    Returns:
+        list: Plan lines indented by depth, or the error message
+    """
+    try:
+        cur = sqlite3.Cursor(con)
+        cur.execute("EXPLAIN QUERY PLAN " + sql, parameters)
+        rows = cur.fetchall()
+    except sqlite3.Error as error:
+        return ['EXPLAIN failed: %s' % error]
+
+    # Rows are (id, parent, notused, detail); depth follows the parent ids
+    depths = {0: -1}
+    lines = []
+    for row in rows:
+        depth = depths.get(row[1], -1) + 1
+        depths[row[0]] = depth
+        lines.append('  ' * depth + row[3])
+    return lines
+
+
+def summarize_profile(profiler, limit=TOP_FUNCTIONS):
+    """
+    Summarize a cProfile run by cumulative time.
+
+    Args:
+        profiler (cProfile.Profile): Finished profiler
+        limit (int): Number of functions to keep
+
+    Returns:
+        list: Functions with calls, own and cumulative time in ms
+    """
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+
+    return [
+        {
+            'function': '%s:%d(%s)' % (filename, line, name),
+            'calls': calls,
+            'primitive_calls': primitive_calls,
+            'own_ms': round(own_time * 1000, 3),
+            'cumulative_ms': round(cumulative_time * 1000, 3)
+        }
+        for (filename, line, name), (primitive_calls, calls, own_time, cumulative_time, _) in rows
+    ]
+
+
+def new_report_id(timestamp):
+    """Build a report id that sorts chronologically."""
+    milliseconds = int(timestamp * 1000) % 1000
+    return '%s-%03d-%s' % (
+        time.strftime('%Y%m%d-%H%M%S', time.localtime(timestamp)),
+        milliseconds,
+        uuid.uuid4().hex[:6]
+    )
+
+
+def write_report(report, directory=PROFILE_DIR, keep=PROFILE_KEEP):
+    """
+    Save a report and delete the oldest ones beyond the limit.
+
+    Args:
+        report (dict): Report returned by RequestProfile.finish
+        directory (str): Report directory
+        keep (int): Number of reports kept
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    # Write to a temporary file first so readers never see partial reports
+    path = os.path.join(directory, report['id'] + '.json')
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w') as report_file:
+        json.dump(report, report_file, indent=2)
+    os.replace(temporary_path, path)
+
+    report_files = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+    for name in report_files[:-keep] if keep > 0 else report_files:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+
+def list_reports(directory=PROFILE_DIR):
+    """
+    List saved reports, newest first.
+
+    Args:
+        directory (str): Report directory
+
+    Returns:
+        list: Report summaries without the queries and functions
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    summaries = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith('.json'):
+            continue
+
+        report = load_report(name[:-len('.json')], directory)
+        if report is None:
+            continue
+
+        report.pop('queries', None)
+        report.pop('functions', None)
+        summaries.append(report)
+    return summaries
+
+
+def load_report(report_id, directory=PROFILE_DIR):
+    """
+    Load a saved report.
+
+    Args:
+        report_id (str): Report id
+        directory (str): Report directory
+
+    Returns:
+        dict: Report, or None if the id is invalid or the report is gone
+    """
+    if not REPORT_ID_PATTERN.match(report_id):
+        return None
+
+    try:
+        with open(os.path.join(directory, report_id + '.json')) as report_file:
+            return json.load(report_file)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,260 @@
+"""
+Salary analytics for the dashboard.
+
+Loads the salary columns of every application in one columnar read and
+computes salary histograms, offered-vs-expected ratios and percentile bands
+by platform, mode and role with vectorized NumPy operations. Archived
+applications are included through archive_salaries, the copy of their salary
+columns kept in the main database. Results are
+cached per data version, so the dashboard only recomputes them after a write.
+"""
+import threading
+
+import numpy as np
+
+# Percentiles reported for every salary band
+PERCENTILES = (25, 50, 75)
+
+# Number of bins used by the salary histogram
+HISTOGRAM_BINS = 10
+
+# Salary columns may hold '' when an optional form field was left empty,
+# so only real numbers are loaded and everything else becomes NULL (NaN)
+SALARY_COLUMNS_QUERY = """
+    SELECT
+        CASE WHEN typeof(salary_range_min) IN ('integer', 'real')
+             THEN salary_range_min END as salary_range_min,
+        CASE WHEN typeof(salary_range_max) IN ('integer', 'real')
+             THEN salary_range_max END as salary_range_max,
+        CASE WHEN typeof(expected_salary) IN ('integer', 'real')
+             THEN expected_salary END as expected_salary,
+        CASE WHEN typeof(salary_offer) IN ('integer', 'real')
+             THEN salary_offer END as salary_offer,
+        CASE WHEN typeof(platform_id) = 'integer'
+             THEN platform_id ELSE 0 END as platform_id,
+        COALESCE(mode, '') as mode,
+        COALESCE(TRIM(role), '') as role
+    FROM (
+        SELECT salary_range_min, salary_range_max, expected_salary, salary_offer,
+               platform_id, mode, role
+        FROM applications
+        UNION ALL
+        SELECT salary_range_min, salary_range_max, expected_salary, salary_offer,
+               platform_id, mode, role
+        FROM archive_salaries
+    )
+"""
+
+cache_lock = threading.Lock()
+cache = {'version': None, 'data': None}
+
+
+def load_salary_columns(con):
+    """
+    Read the salary columns of all hot and archived applications in a
+    single query.
+
+    Args:
+        con (sqlite3.Connection): Open database connection
+
+    Returns:
+        dict: NumPy arrays keyed by column name; salaries are float
+        arrays with NaN for missing values
+    """
+    rows = con.execute(SALARY_COLUMNS_QUERY).fetchall()
+    columns = list(zip(*rows)) if rows else [()] * 7
+
+    return {
+        'salary_range_min': np.array(columns[0], dtype=float),
+        'salary_range_max': np.array(columns[1], dtype=float),
+        'expected_salary': np.array(columns[2], dtype=float),
+        'salary_offer': np.array(columns[3], dtype=float),
+        'platform_id': np.array(columns[4], dtype=np.int64),
+        'mode': np.array(columns[5], dtype=str),
+        'role': np.array(columns[6], dtype=str)
+    }
+
+
+def grouped_percentiles(inverse, group_count, values, percentiles=PERCENTILES):
+    """
+    Compute percentiles of values for every group at once.
+
+    Values are sorted by (group, value) in one lexsort and each group's
+    percentiles are read with linear interpolation, matching
+    numpy.percentile's default method.
+
+    Args:
+        inverse (numpy.ndarray): Group index of every value
+        group_count (int): Number of groups
+        values (numpy.ndarray): Float values, NaN entries are ignored
+        percentiles (tuple): Percentiles to compute (0-100)
+
+    Returns:
+        tuple: (counts, results) where counts has one entry per group and
+        results has shape (group_count, len(percentiles)), NaN for
+        groups without values
+    """
+    valid = ~np.isnan(values)
+    inverse = inverse[valid]
+    values = values[valid]
+
+    counts = np.bincount(inverse, minlength=group_count)
+    results = np.full((group_count, len(percentiles)), np.nan)
+    if values.size == 0:
+        return counts, results
+
+    sorted_values = values[np.lexsort((values, inverse))]
+    starts = np.cumsum(counts) - counts
+
+    # Fractional position of every percentile inside each group
+    quantiles = np.asarray(percentiles, dtype=float) / 100
+    positions = np.maximum(counts[:, None] - 1, 0) * quantiles[None, :]
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    fraction = positions - lower
+
+    last_index = sorted_values.size - 1
+    lower_values = sorted_values[np.minimum(starts[:, None] + lower, last_index)]
+    upper_values = sorted_values[np.minimum(starts[:, None] + upper, last_index)]
+    interpolated = lower_values + (upper_values - lower_values) * fraction
+
+    has_values = counts > 0
+    results[has_values] = interpolated[has_values]
+    return counts, results
+
+
+def to_number(value):
+    """Convert a NumPy scalar to a JSON friendly float (None for NaN)."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, 2)
+
+
+def compute_salary_analytics(columns, platform_names):
+    """
+    Compute histograms, offer ratios and percentile bands.
+
+    Args:
+        columns (dict): Arrays returned by load_salary_columns
+        platform_names (dict): Platform id to platform name
+
+    Returns:
+        dict: JSON serializable analytics with 'applications',
+        'histogram', 'offer_ratio' and 'bands'
+    """
+    range_min = columns['salary_range_min']
+    range_max = columns['salary_range_max']
+
+    # Midpoint of the advertised range, falling back to whichever end exists
+    range_mid = np.where(
+        np.isnan(range_min), range_max,
+        np.where(np.isnan(range_max), range_min, (range_min + range_max) / 2)
+    )
+    metrics = {
+        'expected': columns['expected_salary'],
+        'offer': columns['salary_offer'],
+        'range_mid': range_mid
+    }
+
+    # Histograms share the same bin edges so the series can be compared
+    all_values = np.concatenate([values[~np.isnan(values)] for values in metrics.values()])
+    if all_values.size:
+        edges = np.histogram_bin_edges(all_values, bins=HISTOGRAM_BINS)
+    else:
+        edges = np.array([])
+    histogram = {'edges': [to_number(edge) for edge in edges]}
+    for name, values in metrics.items():
+        if edges.size:
+            counts, _ = np.histogram(values[~np.isnan(values)], bins=edges)
+            histogram[name] = counts.tolist()
+        else:
+            histogram[name] = []
+
+    # Offered vs expected ratio for applications that have both values
+    expected = metrics['expected']
+    offer = metrics['offer']
+    comparable = ~np.isnan(expected) & ~np.isnan(offer) & (expected > 0)
+    ratios = offer[comparable] / expected[comparable]
+    if ratios.size:
+        p25, median, p75 = np.percentile(ratios, PERCENTILES)
+        offer_ratio = {
+            'count': int(ratios.size),
+            'mean': to_number(ratios.mean()),
+            'p25': to_number(p25),
+            'median': to_number(median),
+            'p75': to_number(p75),
+            'above_expected': to_number((ratios >= 1).mean() * 100)
+        }
+    else:
+        offer_ratio = {
+            'count': 0, 'mean': None, 'p25': None,
+            'median': None, 'p75': None, 'above_expected': None
+        }
+
+    # Percentile bands: group indexes are computed once per dimension and
+    # reused for every salary metric
+    dimension_keys = {
+        'platform': columns['platform_id'],
+        'mode': columns['mode'],
+        'role': columns['role']
+    }
+    bands = {}
+    for dimension, keys in dimension_keys.items():
+        labels, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.ravel()
+        totals = np.bincount(inverse, minlength=labels.size)
+
+        metric_results = {
+            name: grouped_percentiles(inverse, labels.size, values)
+            for name, values in metrics.items()
+        }
+
+        rows = []
+        for index in np.argsort(-totals, kind='stable'):
+            if dimension == 'platform':
+                label = platform_names.get(int(labels[index]), 'Unknown')
+            else:
+                label = str(labels[index]) or 'Unknown'
+
+            row = {'label': label, 'applications': int(totals[index])}
+            for name, (counts, results) in metric_results.items():
+                row[name] = {
+                    'count': int(counts[index]),
+                    'p25': to_number(results[index, 0]),
+                    'p50': to_number(results[index, 1]),
+                    'p75': to_number(results[index, 2])
+                }
+            rows.append(row)
+        bands[dimension] = rows
+
+    return {
+        'applications': int(expected.size),
+        'histogram': histogram,
+        'offer_ratio': offer_ratio,
+        'bands': bands
+    }
+
+
+def get_salary_analytics(connect, version, platform_names):
+    """
+    Get salary analytics, recomputing them only when the data version changed.
+
+    Args:
+        connect (callable): Returns a new database connection
+        version (hashable): Current data version
+        platform_names (dict): Platform id to platform name
+
+    Returns:
+        dict: Cached or freshly computed salary analytics
+    """
+    with cache_lock:
+        if cache['data'] is not None and cache['version'] == version:
+            return cache['data']
+
+        con = connect()
+        columns = load_salary_columns(con)
+        con.close()
+
+        data = compute_salary_analytics(columns, platform_names)
+        cache['version'] = version
+        cache['data'] = data
+        return data